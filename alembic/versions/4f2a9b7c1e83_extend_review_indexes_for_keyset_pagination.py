@@ -0,0 +1,46 @@
+"""extend the review indexes with (created_at, id) for keyset pagination
+
+Revision ID: 4f2a9b7c1e83
+Revises: e3a8f61c0d52
+Create Date: 2026-10-17 15:12:40.518207
+
+Новые индексы начинаются с тех же столбцов, что и заменяемые, поэтому
+покрывают и прежние запросы (рейтинги, фильтр по мастеру/салону).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f2a9b7c1e83'
+down_revision: Union[str, Sequence[str], None] = 'e3a8f61c0d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NEW_INDEXES = [
+    ('ix_reviews_master_active_created', 'reviews', ['master_id', 'is_active', 'created_at', 'id']),
+    ('ix_reviews_salon_active_created', 'reviews', ['salon_id', 'is_active', 'created_at', 'id']),
+    ('ix_reviews_created', 'reviews', ['created_at', 'id']),
+]
+REPLACED_INDEXES = [
+    ('ix_reviews_master_active', 'reviews', ['master_id', 'is_active']),
+    ('ix_reviews_salon_active', 'reviews', ['salon_id', 'is_active']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in NEW_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+    for name, table, _ in REPLACED_INDEXES:
+        op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, columns in REPLACED_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+    for name, table, _ in reversed(NEW_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,57 @@
+"""add the rating_summaries table with precomputed ratings of masters and salons
+
+Revision ID: 5b7e2c9d4a10
+Revises: 88948c35dda1
+Create Date: 2026-10-17 12:10:42.518304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2c9d4a10'
+down_revision: Union[str, Sequence[str], None] = '88948c35dda1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL_SQL = """
+    INSERT INTO rating_summaries
+        (entity_type, entity_id, rating_sum, reviews_count, one_star, two_star, three_star, four_star, five_star)
+    SELECT '{entity_type}', {column}, SUM(rating), COUNT(id),
+           SUM(CASE WHEN rating = 1 THEN 1 ELSE 0 END),
+           SUM(CASE WHEN rating = 2 THEN 1 ELSE 0 END),
+           SUM(CASE WHEN rating = 3 THEN 1 ELSE 0 END),
+           SUM(CASE WHEN rating = 4 THEN 1 ELSE 0 END),
+           SUM(CASE WHEN rating = 5 THEN 1 ELSE 0 END)
+    FROM reviews
+    WHERE is_active = true AND {column} IS NOT NULL
+    GROUP BY {column}
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('rating_summaries',
+    sa.Column('entity_type', sa.String(length=16), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('rating_sum', sa.Integer(), nullable=False),
+    sa.Column('reviews_count', sa.Integer(), nullable=False),
+    sa.Column('one_star', sa.Integer(), nullable=False),
+    sa.Column('two_star', sa.Integer(), nullable=False),
+    sa.Column('three_star', sa.Integer(), nullable=False),
+    sa.Column('four_star', sa.Integer(), nullable=False),
+    sa.Column('five_star', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('entity_type', 'entity_id', name='pk_rating_summaries')
+    )
+    # первичное заполнение; повторный пересчёт — python -m src.scripts.backfill_rating_summaries
+    op.execute(BACKFILL_SQL.format(entity_type='master', column='master_id'))
+    op.execute(BACKFILL_SQL.format(entity_type='salon', column='salon_id'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('rating_summaries')
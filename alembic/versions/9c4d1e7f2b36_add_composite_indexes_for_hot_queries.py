@@ -0,0 +1,45 @@
+"""add composite indexes for the hot query shapes of appointments, reviews,
+ schedules and the master_salon/master_service/service_salon reverse lookups
+
+Revision ID: 9c4d1e7f2b36
+Revises: 5b7e2c9d4a10
+Create Date: 2026-10-17 13:02:17.904512
+
+Планы запросов до и после: python -m src.scripts.explain_indexes
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4d1e7f2b36'
+down_revision: Union[str, Sequence[str], None] = '5b7e2c9d4a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_appointments_master_active_time', 'appointments', ['master_id', 'is_active', 'date_time', 'end_time']),
+    ('ix_appointments_salon_date_time', 'appointments', ['salon_id', 'date_time']),
+    ('ix_appointments_client_active_time', 'appointments', ['client_id', 'is_active', 'date_time']),
+    ('ix_reviews_master_active', 'reviews', ['master_id', 'is_active']),
+    ('ix_reviews_salon_active', 'reviews', ['salon_id', 'is_active']),
+    ('ix_master_schedules_salon_day', 'master_schedules', ['salon_id', 'day_of_week']),
+    ('ix_master_salon_salon_master', 'master_salon', ['salon_id', 'master_id']),
+    ('ix_master_service_service_master', 'master_service', ['service_id', 'master_id']),
+    ('ix_service_salon_salon_service', 'service_salon', ['salon_id', 'service_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,35 @@
+"""add (rating, id) review indexes for keyset pagination sorted by rating
+
+Revision ID: a3c8e5d7f210
+Revises: f7b3c2e1a905
+Create Date: 2026-10-17 21:34:12.660918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c8e5d7f210'
+down_revision: Union[str, Sequence[str], None] = 'f7b3c2e1a905'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NEW_INDEXES = [
+    ('ix_reviews_master_active_rating', 'reviews', ['master_id', 'is_active', 'rating', 'id']),
+    ('ix_reviews_salon_active_rating', 'reviews', ['salon_id', 'is_active', 'rating', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in NEW_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(NEW_INDEXES):
+        op.drop_index(name, table_name=table)
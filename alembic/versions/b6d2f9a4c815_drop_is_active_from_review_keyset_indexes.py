@@ -0,0 +1,50 @@
+"""drop is_active from the review keyset indexes so admin listings page in index order
+
+Revision ID: b6d2f9a4c815
+Revises: a3c8e5d7f210
+Create Date: 2026-10-17 22:18:47.093561
+
+Админский список отзывов не фильтрует по is_active, и с is_active между
+столбцом фильтра и ключом сортировки каждая его страница сортировала всю
+выборку. Публичный список отбрасывает неактивные отзывы при чтении строк.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d2f9a4c815'
+down_revision: Union[str, Sequence[str], None] = 'a3c8e5d7f210'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NEW_INDEXES = [
+    ('ix_reviews_master_created', 'reviews', ['master_id', 'created_at', 'id']),
+    ('ix_reviews_salon_created', 'reviews', ['salon_id', 'created_at', 'id']),
+    ('ix_reviews_master_rating', 'reviews', ['master_id', 'rating', 'id']),
+    ('ix_reviews_salon_rating', 'reviews', ['salon_id', 'rating', 'id']),
+]
+REPLACED_INDEXES = [
+    ('ix_reviews_master_active_created', 'reviews', ['master_id', 'is_active', 'created_at', 'id']),
+    ('ix_reviews_salon_active_created', 'reviews', ['salon_id', 'is_active', 'created_at', 'id']),
+    ('ix_reviews_master_active_rating', 'reviews', ['master_id', 'is_active', 'rating', 'id']),
+    ('ix_reviews_salon_active_rating', 'reviews', ['salon_id', 'is_active', 'rating', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in NEW_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+    for name, table, _ in REPLACED_INDEXES:
+        op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, columns in REPLACED_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+    for name, table, _ in reversed(NEW_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,29 @@
+"""add id to the salon journal index for keyset pagination
+
+Revision ID: b81d5e0c3f47
+Revises: 4f2a9b7c1e83
+Create Date: 2026-10-17 15:48:03.127954
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81d5e0c3f47'
+down_revision: Union[str, Sequence[str], None] = '4f2a9b7c1e83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_appointments_salon_time_id', 'appointments', ['salon_id', 'date_time', 'id'], unique=False)
+    op.drop_index('ix_appointments_salon_date_time', table_name='appointments')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_appointments_salon_date_time', 'appointments', ['salon_id', 'date_time'], unique=False)
+    op.drop_index('ix_appointments_salon_time_id', table_name='appointments')
@@ -0,0 +1,66 @@
+"""add the booking_daily_rollups table with daily booking totals for reports
+
+Revision ID: c5e27a9d8b14
+Revises: b81d5e0c3f47
+Create Date: 2026-10-17 19:42:05.127334
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e27a9d8b14'
+down_revision: Union[str, Sequence[str], None] = 'b81d5e0c3f47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+MINUTES_SQL = {
+    'postgresql': "EXTRACT(EPOCH FROM a.end_time - a.date_time) / 60",
+    'sqlite': "(julianday(a.end_time) - julianday(a.date_time)) * 1440",
+}
+
+BACKFILL_SQL = """
+    INSERT INTO booking_daily_rollups
+        (salon_id, master_id, service_id, day, bookings, booked_minutes, revenue, cancellations)
+    SELECT a.salon_id, a.master_id, a.service_id, date(a.date_time),
+           SUM(CASE WHEN a.is_active THEN 1 ELSE 0 END),
+           CAST(ROUND(COALESCE(SUM(CASE WHEN a.is_active THEN {minutes} END), 0)) AS INTEGER),
+           COALESCE(SUM(CASE WHEN a.is_active THEN COALESCE(ms.personal_price, s.base_price) END), 0),
+           SUM(CASE WHEN a.is_active THEN 0 ELSE 1 END)
+    FROM appointments a
+    JOIN services s ON s.id = a.service_id
+    LEFT JOIN master_service ms ON ms.master_id = a.master_id AND ms.service_id = a.service_id
+    GROUP BY a.salon_id, a.master_id, a.service_id, date(a.date_time)
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('booking_daily_rollups',
+    sa.Column('salon_id', sa.Integer(), nullable=False),
+    sa.Column('master_id', sa.Integer(), nullable=False),
+    sa.Column('service_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('bookings', sa.Integer(), nullable=False),
+    sa.Column('booked_minutes', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Integer(), nullable=False),
+    sa.Column('cancellations', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['master_id'], ['masters.id'], ),
+    sa.ForeignKeyConstraint(['salon_id'], ['salons.id'], ),
+    sa.ForeignKeyConstraint(['service_id'], ['services.id'], ),
+    sa.PrimaryKeyConstraint('salon_id', 'master_id', 'service_id', 'day', name='pk_booking_daily_rollups')
+    )
+    op.create_index('ix_booking_daily_rollups_salon_day', 'booking_daily_rollups', ['salon_id', 'day'], unique=False)
+    # первичное заполнение; повторный пересчёт — python -m src.scripts.rebuild_daily_rollups
+    minutes = MINUTES_SQL.get(op.get_bind().dialect.name, MINUTES_SQL['postgresql'])
+    op.execute(BACKFILL_SQL.format(minutes=minutes))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_booking_daily_rollups_salon_day', table_name='booking_daily_rollups')
+    op.drop_table('booking_daily_rollups')
@@ -0,0 +1,41 @@
+"""prevent overlapping active appointments of a master with an exclusion constraint
+
+Revision ID: e3a8f61c0d52
+Revises: 9c4d1e7f2b36
+Create Date: 2026-10-17 13:41:08.220931
+
+Перед применением активные пересекающиеся записи нужно отменить, иначе
+ограничение не создастся. Найти их:
+
+    SELECT a.id, b.id FROM appointments a JOIN appointments b
+      ON a.master_id = b.master_id AND a.id < b.id
+     AND a.date_time < b.end_time AND b.date_time < a.end_time
+    WHERE a.is_active AND b.is_active;
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a8f61c0d52'
+down_revision: Union[str, Sequence[str], None] = '9c4d1e7f2b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # оператор = для integer в индексе gist
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    # date_time и end_time хранятся без часового пояса, поэтому tsrange, а не tstzrange
+    op.execute(
+        "ALTER TABLE appointments ADD CONSTRAINT ex_appointments_master_time_overlap "
+        "EXCLUDE USING gist (master_id WITH =, tsrange(date_time, end_time) WITH &&) "
+        "WHERE (is_active)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('ex_appointments_master_time_overlap', 'appointments')
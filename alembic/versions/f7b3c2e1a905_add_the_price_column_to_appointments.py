@@ -0,0 +1,39 @@
+"""add the price column to appointments with the price charged at booking time
+
+Revision ID: f7b3c2e1a905
+Revises: c5e27a9d8b14
+Create Date: 2026-10-17 21:06:31.804417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7b3c2e1a905'
+down_revision: Union[str, Sequence[str], None] = 'c5e27a9d8b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# для существующих записей — текущая цена мастера (той же ценой их учитывает booking_daily_rollups)
+BACKFILL_SQL = """
+    UPDATE appointments SET price = COALESCE(
+        (SELECT ms.personal_price FROM master_service ms
+         WHERE ms.master_id = appointments.master_id AND ms.service_id = appointments.service_id),
+        (SELECT s.base_price FROM services s WHERE s.id = appointments.service_id)
+    )
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('appointments', sa.Column('price', sa.Integer(), nullable=True))
+    op.execute(BACKFILL_SQL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('appointments', 'price')
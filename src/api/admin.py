@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi import Query
+from datetime import date
 
 from src.schemas import (
     AdminCreate, SalonEdit, SalonCreate, ServiceCreate,
     UserEdit, User, AdminEdit, MasterEdit, ScheduleCreate
 )
 from src.models import admins as DBadmin
+from src.models.appointment import AppointmentStatus
 
 from src.core.security import get_super_admin_from_id, get_admin_from_id
 from src.services.salon_service import SalonService
@@ -109,13 +111,29 @@ async def add_master_to_salon(
 @router.get("/salon/{salon_id}/appointments")
 async def get_appointments_for_salon(
     salon_id: int,
+    date_from: date | None = Query(None, description="Первый день периода (YYYY-MM-DD)"),
+    date_to: date | None = Query(None, description="Последний день периода (YYYY-MM-DD), включительно"),
+    master_id: int | None = Query(None, description="ID мастера"),
+    appointment_status: AppointmentStatus | None = Query(None, alias="status", description="Статус записи"),
+    is_active: bool | None = Query(None, description="Только активные (true) или только отменённые (false)"),
+    limit: int = Query(50, ge=1, le=500, description="Количество записей на странице"),
+    cursor: str | None = Query(None, description="next_cursor предыдущей страницы"),
+    order: str = Query("desc", description="Порядок по времени записи (asc, desc)"),
     admin: DBadmin = Depends(get_admin_from_id),
     service: SalonService = Depends(get_salon_service)
 ):
-    """Получение всех записей салона"""
+    """Журнал записей салона с фильтрами и постраничным выводом"""
     return await service.get_appointments_for_salon(
         salon_id=salon_id,
-        admin_id=admin.id
+        admin_id=admin.id,
+        date_from=date_from,
+        date_to=date_to,
+        master_id=master_id,
+        appointment_status=appointment_status,
+        is_active=is_active,
+        limit=limit,
+        cursor=cursor,
+        order=order
     )
 
 
@@ -5,14 +5,16 @@ from src.services.schedule_service import ScheduleService
 from src.services.salon_service import SalonService
 from src.services.appointment_service import AppointmentService
 from src.schemas import ScheduleCreate
-from .depends_functions import get_salon_service, get_appointment_service, get_schedule_service
+from .depends_functions import get_read_salon_service, get_read_appointment_service, get_read_schedule_service
+from .http_cache import ConditionalGet, conditional_get
 
 router = APIRouter(prefix="/api/v1", tags=["public"])
 
 
 @router.get("/salons")
 async def get_salons(
-    service: SalonService = Depends(get_salon_service)
+    service: SalonService = Depends(get_read_salon_service),
+    conditional: ConditionalGet = Depends(conditional_get)
 ):
     """
     Получение списка всех салонов
@@ -21,7 +23,7 @@ async def get_salons(
         dict: Список салонов
     """
     salons = await service.get_all_salons()
-    return {"status": "success", "data": {"salons": salons}}
+    return conditional.respond({"status": "success", "data": {"salons": salons}})
 
 
 @router.get("/masters")
@@ -29,7 +31,8 @@ async def get_masters(
     salon_id: int | None = Query(None, description="ID салона для фильтрации"),
     service_id: int | None = Query(None, description="ID услуги для фильтрации"),
     target_date: date | None = Query(None, description="Дата для фильтрации по доступности мастеров"),
-    service: SalonService = Depends(get_salon_service)
+    service: SalonService = Depends(get_read_salon_service),
+    conditional: ConditionalGet = Depends(conditional_get)
 ):
     """
     Получение списка мастеров
@@ -42,13 +45,18 @@ async def get_masters(
         dict: Список мастеров
     """
     masters = await service.get_masters(salon_id=salon_id, service_id=service_id, target_date=target_date)
-    return {"status": "success", "data": {"masters": masters}}
+    payload = {"status": "success", "data": {"masters": masters}}
+    if target_date is not None:
+        # доступность зависит от записей, которых нет в кэшах — без ETag
+        return payload
+    return conditional.respond(payload)
 
 
 @router.get("/services")
 async def get_services(
     salon_id: int | None = Query(None, description="ID салона для фильтрации"),
-    service: SalonService = Depends(get_salon_service)
+    service: SalonService = Depends(get_read_salon_service),
+    conditional: ConditionalGet = Depends(conditional_get)
 ):
     """
     Получение списка услуг
@@ -57,7 +65,7 @@ async def get_services(
         dict: Список услуг
     """
     services = await service.get_services(salon_id=salon_id)
-    return {"status": "success","data": {"services": services}}
+    return conditional.respond({"status": "success","data": {"services": services}})
 
 
 @router.get("/free_slots")
@@ -67,7 +75,7 @@ async def get_free_slots(
     target_date: date = Query(..., description="Дата для поиска слотов (YYYY-MM-DD)"),
     master_id: int | None = Query(None, description="ID мастера (опционально, если не указан - слоты для всех мастеров)"),
     min_hours_before: int = Query(2, description="Минимальное количество часов до записи"),
-    appointment_service: AppointmentService = Depends(get_appointment_service)
+    appointment_service: AppointmentService = Depends(get_read_appointment_service)
 ):
     """
     Получение свободных слотов для записи
@@ -92,25 +100,62 @@ async def get_free_slots(
     return {"status": "success", "data": {"slots": slots}}
 
 
+@router.get("/calendar")
+async def get_availability_calendar(
+    salon_id: int = Query(..., description="ID салона"),
+    service_id: int = Query(..., description="ID услуги"),
+    date_from: date | None = Query(None, description="Первый день периода (YYYY-MM-DD), по умолчанию сегодня"),
+    days: int = Query(31, ge=1, le=62, description="Количество дней в периоде"),
+    master_id: int | None = Query(None, description="ID мастера (опционально, если не указан - любой мастер)"),
+    min_hours_before: int = Query(2, description="Минимальное количество часов до записи"),
+    appointment_service: AppointmentService = Depends(get_read_appointment_service)
+):
+    """
+    Календарь доступных для записи дней
+    
+    Args:
+        salon_id: ID салона
+        service_id: ID услуги
+        date_from: Первый день периода
+        days: Количество дней
+        master_id: Опциональный ID мастера
+        min_hours_before: Минимальное количество часов до записи (по умолчанию 2)
+        
+    Returns:
+        dict: По каждому дню признак доступности и количество свободных слотов
+    """
+    calendar = await appointment_service.get_availability_calendar(
+        salon_id=salon_id,
+        service_id=service_id,
+        date_from=date_from or date.today(),
+        days=days,
+        master_id=master_id,
+        min_hours_before=min_hours_before
+    )
+    return {"status": "success", "data": {"days": calendar}}
+
+
 @router.get("/salons/{salon_id}/schedule")
 async def get_salon_schedule_by_id(
     salon_id: int,
-    schedule_service: ScheduleService = Depends(get_schedule_service)):
+    schedule_service: ScheduleService = Depends(get_read_schedule_service),
+    conditional: ConditionalGet = Depends(conditional_get)):
 
     schedule = await schedule_service.get_salon_schedule(salon_id=salon_id)
-    return {"status": "success", "data": {"salon_id": salon_id, "schedule": schedule}}
+    return conditional.respond({"status": "success", "data": {"salon_id": salon_id, "schedule": schedule}})
 
 @router.get("/salons/{salon_id}/masters/{master_id}/schedule")
 async def get_master_schedule_by_id(
     salon_id: int,
     master_id: int,
-    schedule_service: ScheduleService = Depends(get_schedule_service)):
+    schedule_service: ScheduleService = Depends(get_read_schedule_service),
+    conditional: ConditionalGet = Depends(conditional_get)):
 
     schedule = await schedule_service.get_master_schedule(salon_id=salon_id, master_id=master_id)
-    return {"status": "success", 
+    return conditional.respond({"status": "success", 
             "data": {
                 "salon_id": salon_id,
                 "master_id": master_id,
-                "schedule": schedule}}
+                "schedule": schedule}})
 
 
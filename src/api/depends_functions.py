@@ -10,8 +10,9 @@ from src.services.service_service import ServiceService
 from src.services.master_service import MasterService
 from src.services.schedule_service import ScheduleService
 from src.services.review_service import ReviewService
+from src.services.report_service import ReportService
 
-from src.core.database import get_db_session
+from src.core.database import get_db_session, get_read_session
 
 
 
@@ -57,3 +58,22 @@ async def get_review_service(session: AsyncSession = Depends(get_db_session)) ->
     """Создание сервиса отзывов"""
     return ReviewService(session)
 
+
+async def get_read_salon_service(session: AsyncSession = Depends(get_read_session)) -> SalonService:
+    """Создание сервиса салонов для чтения (реплика)"""
+    return SalonService(session)
+
+
+async def get_read_appointment_service(session: AsyncSession = Depends(get_read_session)) -> AppointmentService:
+    """Создание сервиса записей для поиска слотов (реплика)"""
+    return AppointmentService(session)
+
+
+async def get_read_schedule_service(session: AsyncSession = Depends(get_read_session)) -> ScheduleService:
+    """Создание сервиса расписаний для чтения (реплика)"""
+    return ScheduleService(session)
+
+
+async def get_read_report_service(session: AsyncSession = Depends(get_read_session)) -> ReportService:
+    """Создание сервиса отчётов (реплика, если настроена)"""
+    return ReportService(session)
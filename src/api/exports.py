@@ -0,0 +1,87 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from src.core.security import get_admin_from_id
+from src.models import admins as DBadmin
+from src.services.export_service import ExportService, EXPORT_FORMATS
+from src.services.salon_service import SalonService
+
+from .depends_functions import get_salon_service
+
+router = APIRouter(prefix="/admin", tags=["admin_exports"])
+
+
+def _export_response(service: ExportService, query, export_format: str, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        service.stream(query, export_format),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'}
+    )
+
+
+@router.get("/salon/{salon_id}/export/appointments")
+async def export_appointments(
+    salon_id: int,
+    date_from: date | None = Query(None, description="Первый день периода (YYYY-MM-DD)"),
+    date_to: date | None = Query(None, description="Последний день периода (YYYY-MM-DD), включительно"),
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson или csv"),
+    admin: DBadmin = Depends(get_admin_from_id),
+    salon_service: SalonService = Depends(get_salon_service)
+):
+    """
+    Выгрузка всех записей салона за период потоком (NDJSON или CSV)
+
+    Args:
+        salon_id: ID салона
+        date_from: Первый день периода (по времени записи)
+        date_to: Последний день периода
+        export_format: Формат выгрузки
+        admin: Текущий администратор
+        salon_service: Сервис салонов (проверка доступа)
+
+    Returns:
+        StreamingResponse: строки выгрузки в порядке времени записи
+    """
+    await salon_service.get_salon_for_admin(admin_id=admin.id, salon_id=salon_id)
+    service = ExportService()
+    return _export_response(
+        service,
+        service.appointments_query(salon_id, date_from, date_to),
+        export_format,
+        f"salon-{salon_id}-appointments"
+    )
+
+
+@router.get("/salon/{salon_id}/export/reviews")
+async def export_reviews(
+    salon_id: int,
+    date_from: date | None = Query(None, description="Первый день периода (YYYY-MM-DD)"),
+    date_to: date | None = Query(None, description="Последний день периода (YYYY-MM-DD), включительно"),
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson или csv"),
+    admin: DBadmin = Depends(get_admin_from_id),
+    salon_service: SalonService = Depends(get_salon_service)
+):
+    """
+    Выгрузка отзывов о салоне и его мастерах за период потоком (NDJSON или CSV)
+
+    Args:
+        salon_id: ID салона
+        date_from: Первый день периода (по дате отзыва)
+        date_to: Последний день периода
+        export_format: Формат выгрузки
+        admin: Текущий администратор
+        salon_service: Сервис салонов (проверка доступа)
+
+    Returns:
+        StreamingResponse: строки выгрузки в порядке ID отзыва
+    """
+    await salon_service.get_salon_for_admin(admin_id=admin.id, salon_id=salon_id)
+    service = ExportService()
+    return _export_response(
+        service,
+        service.reviews_query(salon_id, date_from, date_to),
+        export_format,
+        f"salon-{salon_id}-reviews"
+    )
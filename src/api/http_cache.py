@@ -0,0 +1,66 @@
+import hashlib
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src.core.cache import track_cache_reads, stop_tracking_cache_reads
+
+
+class ConditionalGet:
+    """
+    ETag для ответа, собранного из данных кэшей (CacheNamespace)
+
+    ETag считается по отпечаткам прочитанных значений, поэтому не зависит от
+    процесса и меняется только вместе с данными. Если клиент прислал совпадающий
+    If-None-Match, ответ 304 отдаётся без сериализации тела.
+    """
+
+    def __init__(self, request: Request, reads: list[str]):
+        self.request = request
+        self.reads = reads
+
+    def etag(self) -> str | None:
+        if not self.reads:
+            return None
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(self.request.url.path).encode())
+        digest.update(self.request.url.query.encode())
+        for value_fingerprint in self.reads:
+            digest.update(value_fingerprint.encode())
+        return f'"{digest.hexdigest()}"'
+
+    def not_modified(self, etag: str) -> bool:
+        if_none_match = self.request.headers.get("if-none-match")
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        # If-None-Match сравнивается без учёта признака слабого валидатора
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag in candidates
+
+    def respond(self, payload) -> Response:
+        """
+        Ответ с ETag или 304, если данные не менялись
+
+        Данные должны быть уже прочитаны (через сервисы) до вызова.
+        Без прочитанных значений кэша ответ отдаётся без ETag.
+        """
+        etag = self.etag()
+        if etag is None:
+            return JSONResponse(jsonable_encoder(payload))
+        # no-cache: клиент может хранить ответ, но перепроверяет его при каждом запросе
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if self.not_modified(etag):
+            return Response(status_code=304, headers=headers)
+        return JSONResponse(jsonable_encoder(payload), headers=headers)
+
+
+async def conditional_get(request: Request):
+    """Зависимость для GET-обработчиков с условными запросами (If-None-Match)"""
+    reads, token = track_cache_reads()
+    try:
+        yield ConditionalGet(request, reads)
+    finally:
+        stop_tracking_cache_reads(token)
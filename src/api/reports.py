@@ -0,0 +1,79 @@
+from datetime import date, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from src.core.security import get_admin_from_id
+from src.models import admins as DBadmin
+from src.services.report_service import ReportService
+
+from .depends_functions import get_read_report_service
+
+router = APIRouter(prefix="/admin/reports", tags=["admin_reports"])
+
+DEFAULT_REPORT_DAYS = 30
+
+
+def report_scope(
+    salon_id: int | None = Query(None, description="ID салона; по умолчанию все салоны администратора"),
+    date_from: date | None = Query(None, description="Первый день периода (YYYY-MM-DD), по умолчанию 30 дней назад"),
+    date_to: date | None = Query(None, description="Последний день периода (YYYY-MM-DD), по умолчанию сегодня"),
+    admin: DBadmin = Depends(get_admin_from_id)
+) -> tuple[list[int] | None, date, date]:
+    """
+    Салоны и период отчёта
+
+    Администратор видит только свои салоны, супер-администратор — любые.
+
+    Returns:
+        tuple: ID салонов (None — все салоны), первый и последний день периода
+    """
+    date_to = date_to or date.today()
+    date_from = date_from or date_to - timedelta(days=DEFAULT_REPORT_DAYS - 1)
+    if date_from > date_to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="date_from must not be after date_to")
+
+    if salon_id is not None:
+        if not admin.super_admin and salon_id not in {salon.id for salon in admin.salons}:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Недостаточно прав для доступа к этому салону"
+            )
+        return [salon_id], date_from, date_to
+    if admin.super_admin:
+        return None, date_from, date_to
+    return [salon.id for salon in admin.salons], date_from, date_to
+
+
+@router.get("/bookings")
+async def get_bookings_report(
+    period: str = Query("day", pattern="^(day|week|month)$", description="Группировка: day, week, month"),
+    scope: tuple = Depends(report_scope),
+    service: ReportService = Depends(get_read_report_service)
+):
+    """Количество записей (и отмен) за день, неделю или месяц"""
+    salon_ids, date_from, date_to = scope
+    rows = await service.bookings_per_period(salon_ids, date_from, date_to, period)
+    return {"status": "success", "data": {"period": period, "date_from": date_from, "date_to": date_to, "rows": rows}}
+
+
+@router.get("/masters")
+async def get_masters_report(
+    scope: tuple = Depends(report_scope),
+    service: ReportService = Depends(get_read_report_service)
+):
+    """Загрузка мастеров: записи, занятые и рабочие минуты по расписанию"""
+    salon_ids, date_from, date_to = scope
+    rows = await service.master_utilization(salon_ids, date_from, date_to)
+    return {"status": "success", "data": {"date_from": date_from, "date_to": date_to, "masters": rows}}
+
+
+@router.get("/services")
+async def get_services_report(
+    limit: int = Query(10, ge=1, le=100, description="Количество услуг"),
+    scope: tuple = Depends(report_scope),
+    service: ReportService = Depends(get_read_report_service)
+):
+    """Самые популярные услуги по числу записей"""
+    salon_ids, date_from, date_to = scope
+    rows = await service.top_services(salon_ids, date_from, date_to, limit)
+    return {"status": "success", "data": {"date_from": date_from, "date_to": date_to, "services": rows}}
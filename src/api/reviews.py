@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, Query, status
 
 from src.core.security import get_user_from_id, get_admin_from_id
-from src.core.database import get_db_session
+from src.core.database import get_db_session, get_read_session
 from src.models import users as DBUser
 from src.models import admins as DBAdmin
 from src.services.review_service import ReviewService
-from src.schemas.review import ReviewCreate, ReviewUpdate, ReviewResponse, RatingStatsResponse
+from src.schemas.review import ReviewCreate, ReviewUpdate, ReviewResponse, ReviewPage, RatingStatsResponse
+from .http_cache import ConditionalGet, conditional_get
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -18,6 +19,11 @@ async def get_review_service(session: AsyncSession = Depends(get_db_session)) ->
     return ReviewService(session)
 
 
+async def get_read_review_service(session: AsyncSession = Depends(get_read_session)) -> ReviewService:
+    """Создание сервиса отзывов для публичных списков и рейтингов (реплика)"""
+    return ReviewService(session)
+
+
 @router.post(
     "/",
     response_model=ReviewResponse,
@@ -51,17 +57,17 @@ async def create_review(
 
 @router.get(
     "/",
-    response_model=list[ReviewResponse],
+    response_model=ReviewPage,
     summary="Список отзывов"
 )
 async def get_reviews(
     master_id: int | None = Query(None, description="Фильтр по ID мастера"),
     salon_id: int | None = Query(None, description="Фильтр по ID салона"),
     limit: int = Query(20, ge=1, le=100, description="Количество результатов"),
-    offset: int = Query(0, ge=0, description="Смещение"),
+    cursor: str | None = Query(None, description="next_cursor предыдущей страницы"),
     sort_by: str = Query("created_at", description="Сортировка по полю (created_at, rating)"),
     order: str = Query("desc", description="Порядок (asc, desc)"),
-    service: ReviewService = Depends(get_review_service)
+    service: ReviewService = Depends(get_read_review_service)
 ):
     """
     Получение списка отзывов.
@@ -72,29 +78,29 @@ async def get_reviews(
     - `sort_by`: Сортировка по полю (created_at, rating)
     - `order`: Порядок (asc, desc)
     - `limit`: Количество результатов (макс 100)
-    - `offset`: Смещение для пагинации
+    - `cursor`: Курсор следующей страницы из `next_cursor` (с теми же `sort_by` и `order`)
     
     Args:
         master_id: ID мастера для фильтра
         salon_id: ID салона для фильтра
         limit: Количество результатов
-        offset: Смещение
+        cursor: Курсор страницы
         sort_by: Поле для сортировки
         order: Порядок сортировки
         service: Сервис отзывов (внедряется через DI)
         
     Returns:
-        list[ReviewResponse]: Список отзывов
+        ReviewPage: Отзывы страницы и курсор следующей (null на последней странице)
     """
-    reviews = await service.get_reviews(
+    reviews, next_cursor = await service.get_reviews(
         master_id=master_id,
         salon_id=salon_id,
         limit=limit,
-        offset=offset,
+        cursor=cursor,
         sort_by=sort_by,
         order=order
     )
-    return reviews
+    return {"items": reviews, "next_cursor": next_cursor}
 
 
 @router.get(
@@ -104,7 +110,8 @@ async def get_reviews(
 )
 async def get_master_rating(
     master_id: int,
-    service: ReviewService = Depends(get_review_service)
+    service: ReviewService = Depends(get_read_review_service),
+    conditional: ConditionalGet = Depends(conditional_get)
 ):
     """
     Получение статистики рейтинга мастера
@@ -112,12 +119,13 @@ async def get_master_rating(
     Args:
         master_id: ID мастера
         service: Сервис отзывов (внедряется через DI)
+        conditional: ETag и ответ 304 по If-None-Match (внедряется через DI)
         
     Returns:
         RatingStatsResponse: Статистика рейтинга
     """
     stats = await service.get_rating_stats(master_id=master_id)
-    return stats
+    return conditional.respond(stats)
 
 
 @router.get(
@@ -127,7 +135,8 @@ async def get_master_rating(
 )
 async def get_salon_rating(
     salon_id: int,
-    service: ReviewService = Depends(get_review_service)
+    service: ReviewService = Depends(get_read_review_service),
+    conditional: ConditionalGet = Depends(conditional_get)
 ):
     """
     Получение статистики рейтинга салона
@@ -135,12 +144,13 @@ async def get_salon_rating(
     Args:
         salon_id: ID салона
         service: Сервис отзывов (внедряется через DI)
+        conditional: ETag и ответ 304 по If-None-Match (внедряется через DI)
         
     Returns:
         RatingStatsResponse: Статистика рейтинга
     """
     stats = await service.get_rating_stats(salon_id=salon_id)
-    return stats
+    return conditional.respond(stats)
 
 
 @router.delete(
@@ -204,7 +214,7 @@ async def update_review(
 
 @admin_router.get(
     "/",
-    response_model=list[ReviewResponse],
+    response_model=ReviewPage,
     summary="Список всех отзывов (админ)"
 )
 async def get_all_reviews_admin(
@@ -212,7 +222,7 @@ async def get_all_reviews_admin(
     salon_id: int | None = Query(None, description="Фильтр по салону"),
     is_moderated: bool | None = Query(None, description="Фильтр по модерации (True/False/None для всех)"),
     limit: int = Query(50, ge=1, le=500, description="Количество результатов"),
-    offset: int = Query(0, ge=0, description="Смещение"),
+    cursor: str | None = Query(None, description="next_cursor предыдущей страницы"),
     sort_by: str = Query("created_at", description="Сортировка (created_at, rating)"),
     order: str = Query("desc", description="Порядок (asc, desc)"),
     admin: DBAdmin = Depends(get_admin_from_id),
@@ -228,37 +238,37 @@ async def get_all_reviews_admin(
         salon_id: Фильтр по салону
         is_moderated: Фильтр по статусу модерации
         limit: Количество результатов (макс 500)
-        offset: Смещение для пагинации
+        cursor: Курсор следующей страницы из next_cursor
         sort_by: Поле для сортировки
         order: Порядок сортировки
         admin: Текущий администратор
         service: Сервис отзывов
         
     Returns:
-        list[ReviewResponse]: Список всех отзывов
+        ReviewPage: Отзывы страницы и курсор следующей
     """
-    reviews = await service.get_all_reviews_admin(
+    reviews, next_cursor = await service.get_all_reviews_admin(
         master_id=master_id,
         salon_id=salon_id,
         is_moderated=is_moderated,
         limit=limit,
-        offset=offset,
+        cursor=cursor,
         sort_by=sort_by,
         order=order
     )
-    return reviews
+    return {"items": reviews, "next_cursor": next_cursor}
 
 
 @admin_router.get(
     "/salon/{salon_id}",
-    response_model=list[ReviewResponse],
+    response_model=ReviewPage,
     summary="Отзывы конкретного салона (админ)"
 )
 async def get_salon_reviews_admin(
     salon_id: int,
     is_moderated: bool | None = Query(None),
     limit: int = Query(50, ge=1, le=500),
-    offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None),
     admin: DBAdmin = Depends(get_admin_from_id),
     service: ReviewService = Depends(get_review_service)
 ):
@@ -269,23 +279,20 @@ async def get_salon_reviews_admin(
         salon_id: ID салона
         is_moderated: Фильтр по модерации
         limit: Количество результатов
-        offset: Смещение
+        cursor: Курсор следующей страницы из next_cursor
         admin: Текущий администратор
         service: Сервис отзывов
         
     Returns:
-        list[ReviewResponse]: Список отзывов салона
+        ReviewPage: Отзывы салона и курсор следующей страницы
     """
-    reviews = await service.get_reviews(
+    reviews, next_cursor = await service.get_reviews(
         salon_id=salon_id,
         limit=limit,
-        offset=offset
+        cursor=cursor,
+        is_moderated=is_moderated
     )
-    
-    if is_moderated is not None:
-        reviews = [r for r in reviews if r.is_moderated == is_moderated]
-    
-    return reviews
+    return {"items": reviews, "next_cursor": next_cursor}
 
 
 @admin_router.put(
@@ -0,0 +1,149 @@
+import hashlib
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+
+from .cache_backend import cache_backend
+from .utils import get_setting
+
+
+CATALOG_CACHE_TTL_SECONDS = get_setting("CATALOG_CACHE_TTL_SECONDS", 60)
+CATALOG_CACHE_MAXSIZE = get_setting("CATALOG_CACHE_MAXSIZE", 1024)
+SCHEDULE_CACHE_TTL_SECONDS = get_setting("SCHEDULE_CACHE_TTL_SECONDS", 300)
+SCHEDULE_CACHE_MAXSIZE = get_setting("SCHEDULE_CACHE_MAXSIZE", 4096)
+RATING_CACHE_TTL_SECONDS = get_setting("RATING_CACHE_TTL_SECONDS", 60)
+RATING_CACHE_MAXSIZE = get_setting("RATING_CACHE_MAXSIZE", 10_000)
+
+
+_MISSING = object()
+
+# Отпечатки значений, прочитанных из CacheNamespace в текущем запросе (для ETag)
+_cache_reads: ContextVar[list[str] | None] = ContextVar("cache_reads", default=None)
+
+
+def fingerprint(value) -> str:
+    """Отпечаток содержимого значения кэша: одинаковые данные дают одинаковый отпечаток в любом процессе"""
+    return hashlib.blake2b(repr(value).encode(), digest_size=16).hexdigest()
+
+
+class TTLCache:
+    """
+    Кэш в памяти процесса с ограничением размера (LRU) и временем жизни записей
+
+    Предназначен для использования из event loop, блокировок не требует.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key, default=None):
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value, ttl: float | None = None) -> None:
+        self._data[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheNamespace:
+    """
+    Группа связанных записей кэша с общей инвалидацией
+
+    Загрузка, во время которой группа была инвалидирована, не кэшируется:
+    она могла прочитать данные до изменения. Инвалидация рассылается через
+    backend, и другие процессы сбрасывают у себя ту же группу.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float, backend=cache_backend):
+        self.name = name
+        self._cache = TTLCache(maxsize, ttl)
+        self.version = 0
+        self._changed_at: float | None = None
+        self.backend = backend
+        backend.subscribe(name, self._on_remote_invalidate)
+
+    def get(self, key, default=None):
+        entry = self._cache.get(key, _MISSING)
+        return default if entry is _MISSING else entry[0]
+
+    def set(self, key, value, loaded_version: int, max_lag: float = 0.0, value_fingerprint: str | None = None) -> None:
+        """
+        Args:
+            loaded_version: значение version до чтения данных
+            max_lag: допустимое отставание источника (реплики) в секундах; если
+                инвалидация была за это время, значение не кэшируется
+        """
+        if loaded_version != self.version:
+            return
+        if max_lag and self._changed_at is not None and time.monotonic() - self._changed_at < max_lag:
+            return
+        self._cache.set(key, (value, value_fingerprint or fingerprint(value)))
+
+    async def get_or_load(self, key, loader, max_lag: float = 0.0):
+        """Значение из кэша или результат await loader(), который сохраняется в кэш"""
+        entry = self._cache.get(key, _MISSING)
+        if entry is _MISSING:
+            loaded_version = self.version
+            value = await loader()
+            entry = (value, fingerprint(value))
+            self.set(key, value, loaded_version, max_lag, entry[1])
+        reads = _cache_reads.get()
+        if reads is not None:
+            reads.append(entry[1])
+        return entry[0]
+
+    def invalidate(self) -> None:
+        """Сбросить группу во всех процессах (вызывать после commit изменяющей транзакции)"""
+        self._drop()
+        self.backend.publish({"ns": self.name})
+
+    def _on_remote_invalidate(self, message: dict | None) -> None:
+        self._drop()
+
+    def _drop(self) -> None:
+        self.version += 1
+        self._changed_at = time.monotonic()
+        self._cache.clear()
+
+
+def track_cache_reads() -> tuple[list[str], object]:
+    """
+    Начать сбор отпечатков значений, прочитанных из кэшей в текущем контексте
+
+    Returns:
+        tuple: список, в который добавляются отпечатки, и токен для stop_tracking_cache_reads
+    """
+    reads: list[str] = []
+    return reads, _cache_reads.set(reads)
+
+
+def stop_tracking_cache_reads(token) -> None:
+    _cache_reads.reset(token)
+
+
+# Каталог: салоны, услуги, мастера вместе с их рейтингами
+catalog_cache = CacheNamespace("catalog", CATALOG_CACHE_MAXSIZE, CATALOG_CACHE_TTL_SECONDS)
+# Расписания салонов и мастеров
+schedule_cache = CacheNamespace("schedules", SCHEDULE_CACHE_MAXSIZE, SCHEDULE_CACHE_TTL_SECONDS)
+# Статистика рейтингов мастеров и салонов
+rating_cache = CacheNamespace("ratings", RATING_CACHE_MAXSIZE, RATING_CACHE_TTL_SECONDS)
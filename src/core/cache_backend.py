@@ -0,0 +1,182 @@
+import asyncio
+import json
+import logging
+import uuid
+
+from .utils import get_setting
+
+
+logger = logging.getLogger(__name__)
+
+# memory:// — только кэш процесса; redis://host:port/db — рассылка инвалидаций между воркерами и узлами
+CACHE_BACKEND_URL = get_setting("CACHE_BACKEND_URL", "memory://")
+CACHE_INVALIDATION_CHANNEL = get_setting("CACHE_INVALIDATION_CHANNEL", "style_and_barber:cache-invalidation")
+CACHE_BACKEND_CONNECT_TIMEOUT = get_setting("CACHE_BACKEND_CONNECT_TIMEOUT", 5.0)
+CACHE_BACKEND_MAX_RECONNECT_DELAY = get_setting("CACHE_BACKEND_MAX_RECONNECT_DELAY", 30.0)
+
+# Отличает сообщения этого процесса: свои инвалидации уже применены локально
+PROCESS_TOKEN = uuid.uuid4().hex
+
+
+class MemoryBackend:
+    """
+    Бэкенд без рассылки: кэши живут только в памяти процесса
+
+    Подходит для одного воркера; изменения, сделанные другими процессами,
+    видны после истечения TTL записей.
+    """
+
+    def __init__(self):
+        self._handlers: dict[str, list] = {}
+
+    def subscribe(self, namespace: str, handler) -> None:
+        """
+        Обработчик инвалидаций группы namespace из других процессов
+
+        handler(message) получает словарь сообщения или None, если сообщения могли
+        быть потеряны (переподключение) и группу нужно сбросить целиком.
+        """
+        self._handlers.setdefault(namespace, []).append(handler)
+
+    def publish(self, message: dict) -> None:
+        """Разослать инвалидацию другим процессам (message["ns"] — имя группы)"""
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    def _dispatch(self, message: dict) -> None:
+        for handler in self._handlers.get(message.get("ns"), ()):
+            try:
+                handler(message)
+            except Exception:
+                logger.exception("cache invalidation handler failed for %s", message.get("ns"))
+
+    def _reset_all(self) -> None:
+        for handlers in self._handlers.values():
+            for handler in handlers:
+                handler(None)
+
+
+class RedisBackend(MemoryBackend):
+    """
+    Рассылка инвалидаций через Redis pub/sub
+
+    Данные по-прежнему хранятся в памяти каждого процесса, через Redis передаются
+    только сообщения об изменениях. Публикация не блокирует запрос: сообщение
+    отправляется фоновой задачей. После обрыва соединения подписчик
+    переподключается и сбрасывает все группы, так как мог пропустить сообщения.
+
+    Args:
+        client: клиент redis.asyncio (или совместимый, например fakeredis)
+        channel: канал pub/sub
+    """
+
+    def __init__(self, client, channel: str = CACHE_INVALIDATION_CHANNEL):
+        super().__init__()
+        self.client = client
+        self.channel = channel
+        self._listener: asyncio.Task | None = None
+        self._subscribed = asyncio.Event()
+        self._pending: set[asyncio.Task] = set()
+
+    def publish(self, message: dict) -> None:
+        payload = json.dumps({**message, "origin": PROCESS_TOKEN}, default=str)
+        try:
+            task = asyncio.get_running_loop().create_task(self._send(payload))
+        except RuntimeError:
+            # вне event loop отправлять некому: синхронный код вызывает только локальную инвалидацию
+            return
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _send(self, payload: str) -> None:
+        try:
+            await self.client.publish(self.channel, payload)
+        except Exception:
+            logger.warning("cache invalidation publish failed", exc_info=True)
+
+    async def start(self) -> None:
+        """Запуск подписчика; ждёт подписки, чтобы не пропустить первые сообщения"""
+        if self._listener is not None:
+            return
+        self._listener = asyncio.create_task(self._listen())
+        try:
+            await asyncio.wait_for(self._subscribed.wait(), CACHE_BACKEND_CONNECT_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("cache invalidation channel is not available yet, retrying in background")
+
+    async def close(self) -> None:
+        """Дождаться отправки сообщений и остановить подписчика"""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        await self.client.aclose()
+
+    async def _listen(self) -> None:
+        delay = 0.5
+        reconnecting = False
+        while True:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                if reconnecting:
+                    self._reset_all()
+                self._subscribed.set()
+                delay = 0.5
+                async for raw in pubsub.listen():
+                    self._handle(raw)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("cache invalidation channel lost, reconnecting in %.1fs", delay, exc_info=True)
+            finally:
+                self._subscribed.clear()
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+            reconnecting = True
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, CACHE_BACKEND_MAX_RECONNECT_DELAY)
+
+    def _handle(self, raw: dict) -> None:
+        if raw.get("type") != "message":
+            return
+        try:
+            message = json.loads(raw["data"])
+        except (TypeError, ValueError):
+            logger.warning("malformed cache invalidation message: %r", raw.get("data"))
+            return
+        if message.get("origin") == PROCESS_TOKEN:
+            return
+        self._dispatch(message)
+
+
+def create_cache_backend(url: str = CACHE_BACKEND_URL) -> MemoryBackend:
+    """
+    Бэкенд по строке подключения
+
+    memory:// — без рассылки; redis://, rediss://, unix:// — Redis (нужен пакет redis);
+    fakeredis:// — Redis в памяти процесса для проверок (нужен пакет fakeredis).
+    """
+    scheme = url.split("://", 1)[0].lower()
+    if scheme == "memory":
+        return MemoryBackend()
+    if scheme in ("redis", "rediss", "unix"):
+        import redis.asyncio as redis_asyncio
+
+        return RedisBackend(redis_asyncio.from_url(url))
+    if scheme == "fakeredis":
+        import fakeredis
+
+        return RedisBackend(fakeredis.FakeAsyncRedis())
+    raise ValueError(f"Unsupported CACHE_BACKEND_URL scheme: {scheme}")
+
+
+cache_backend = create_cache_backend()
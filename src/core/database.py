@@ -1,23 +1,100 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+import os
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 from  src.models import Base
 
 from .config import DATABASE_URL
+from .instrumentation import install_query_instrumentation
+from .metrics import InstrumentedQueuePool, register_pool_metrics
+from .utils import get_setting
+
+
+# Число воркеров uvicorn/gunicorn на хосте (их же переменная окружения); соединения делятся между ними
+WEB_CONCURRENCY = get_setting("WEB_CONCURRENCY", 1)
+# Постоянных соединений на хост по умолчанию: 2 * CPU + 1
+DB_CONNECTION_BUDGET = get_setting("DB_CONNECTION_BUDGET", 2 * (os.cpu_count() or 1) + 1)
+
+DB_POOL_SIZE = get_setting("DB_POOL_SIZE", max(2, DB_CONNECTION_BUDGET // max(1, WEB_CONCURRENCY)))
+DB_MAX_OVERFLOW = get_setting("DB_MAX_OVERFLOW", DB_POOL_SIZE)
+DB_POOL_TIMEOUT = get_setting("DB_POOL_TIMEOUT", 30.0)
+DB_POOL_RECYCLE = get_setting("DB_POOL_RECYCLE", 1800)
+DB_POOL_PRE_PING = get_setting("DB_POOL_PRE_PING", True)
+# 0 отключает кэш подготовленных выражений asyncpg (нужно за pgbouncer в режиме transaction)
+DB_STATEMENT_CACHE_SIZE = get_setting("DB_STATEMENT_CACHE_SIZE", 100)
+# 0 — без ограничения
+DB_STATEMENT_TIMEOUT_MS = get_setting("DB_STATEMENT_TIMEOUT_MS", 0)
+DB_ECHO = get_setting("DB_ECHO", False)
+
+# Реплика для публичных GET-запросов; без неё чтение идёт в основную базу
+DATABASE_REPLICA_URL = get_setting("DATABASE_REPLICA_URL", None)
+# Сколько секунд реплика может отставать: данные, изменённые за это время, не кэшируются по чтениям с реплики
+DB_REPLICA_MAX_LAG_SECONDS = get_setting("DB_REPLICA_MAX_LAG_SECONDS", 5.0)
+
+
+def engine_options(database_url: str) -> dict:
+    """
+    Параметры create_async_engine из настроек
+
+    Args:
+        database_url: строка подключения
 
+    Returns:
+        dict: параметры пула и подключения для драйвера из строки подключения
+    """
+    options = {
+        "echo": DB_ECHO,
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    if make_url(database_url).get_driver_name() == "asyncpg":
+        connect_args = {"prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE}
+        if DB_STATEMENT_TIMEOUT_MS:
+            connect_args["server_settings"] = {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+        options["connect_args"] = connect_args
+    return options
 
-engine = create_async_engine(
-    DATABASE_URL, 
-    echo=False,
-    pool_size=5,
-    max_overflow=10
-    )
+
+def build_engine(database_url: str, label: str = "primary") -> AsyncEngine:
+    """Движок с параметрами из настроек, счётчиками запросов и метриками пула"""
+    new_engine = create_async_engine(database_url, **engine_options(database_url))
+    install_query_instrumentation(new_engine)
+    register_pool_metrics(new_engine, label)
+    return new_engine
+
+
+engine = build_engine(DATABASE_URL)
 
 AssyncSessionLocal = async_sessionmaker(
-    engine, 
+    engine,
     expire_on_commit=False,  # не инвалидировать объекты после commit
     class_=AsyncSession
-) 
+)
+
+read_engine = build_engine(DATABASE_REPLICA_URL, label="replica") if DATABASE_REPLICA_URL else engine
+
+AsyncReadSessionLocal = async_sessionmaker(
+    read_engine,
+    expire_on_commit=False,
+    class_=AsyncSession,
+    info={"replica_max_lag": DB_REPLICA_MAX_LAG_SECONDS if DATABASE_REPLICA_URL else 0.0}
+)
 
 async def get_db_session():
     async with AssyncSessionLocal() as session:
         yield session
 
+
+async def get_read_session():
+    """
+    Сессия только для чтения (реплика, если настроена)
+
+    Только для запросов без записи: данные на реплике могут отставать, поэтому
+    чтение после собственной записи остаётся на get_db_session.
+    """
+    async with AsyncReadSessionLocal() as session:
+        yield session
@@ -0,0 +1,117 @@
+import logging
+import sys
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+import greenlet
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .utils import get_setting
+
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = get_setting("SLOW_QUERY_MS", 200.0)
+SERVICES_PACKAGE = "src.services"
+
+
+@dataclass
+class RequestQueryStats:
+    """SQL-запросы, выполненные в рамках одного HTTP-запроса"""
+    queries: int = 0
+    db_time: float = 0.0
+
+
+_request_query_stats: ContextVar[RequestQueryStats | None] = ContextVar("request_query_stats", default=None)
+
+
+def current_query_stats() -> RequestQueryStats | None:
+    """Статистика текущего HTTP-запроса или None вне запроса"""
+    return _request_query_stats.get()
+
+
+def _query_origin() -> str | None:
+    """
+    Метод сервиса, из которого выполняется запрос
+
+    Обработчики событий движка работают в дочернем greenlet SQLAlchemy, поэтому
+    корутины сервисов ищутся и в стеке родительского greenlet.
+    """
+    frames = [sys._getframe()]
+    parent = greenlet.getcurrent().parent
+    if parent is not None and parent.gr_frame is not None:
+        frames.append(parent.gr_frame)
+    for frame in frames:
+        while frame is not None:
+            module = frame.f_globals.get("__name__", "")
+            if module.startswith(SERVICES_PACKAGE):
+                return f"{module}.{frame.f_code.co_qualname}"
+            frame = frame.f_back
+    return None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+
+    stats = _request_query_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        logger.warning(
+            "slow query %.1f ms in %s: %s",
+            elapsed * 1000,
+            _query_origin() or "unknown",
+            " ".join(statement.split())[:1000]
+        )
+
+
+def install_query_instrumentation(engine: AsyncEngine) -> None:
+    """Подсчёт и замер SQL-запросов движка, журнал медленных запросов"""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware: число и время SQL-запросов запроса в заголовках ответа
+
+    X-DB-Queries — число запросов, Server-Timing — время в БД и общее время
+    обработки к моменту отправки заголовков.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _request_query_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - started) * 1000
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(stats.queries).encode()))
+                headers.append((
+                    b"server-timing",
+                    f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries", app;dur={total_ms:.1f}'.encode()
+                ))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _request_query_stats.reset(token)
@@ -0,0 +1,226 @@
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Метрика с набором меток в текстовом формате Prometheus"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels.get(name, "") for name in self.labelnames)
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple, float] = defaultdict(float)
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        self._values[self._key(labels)] += amount
+
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(Metric):
+    """Значения снимаются функцией в момент чтения /metrics"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._callbacks: dict[tuple, callable] = {}
+
+    def set_function(self, func, **labels) -> None:
+        self._callbacks[self._key(labels)] = func
+
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(func())}"
+            for key, func in sorted(self._callbacks.items(), key=lambda item: item[0])
+        ]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # по каждому набору меток: число наблюдений в каждой корзине (без накопления), сумма, количество
+        self._counts: dict[tuple, list[int]] = {}
+        self._sums: dict[tuple, float] = defaultdict(float)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    def samples(self) -> list[str]:
+        lines = []
+        for key, counts in sorted(self._counts.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = f'le="{_format_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_number(self._sums[key])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+registry = Registry()
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status")
+))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route")
+))
+db_pool_size = registry.register(Gauge(
+    "db_pool_size", "Configured number of persistent connections", ("pool",)
+))
+db_pool_checked_out = registry.register(Gauge(
+    "db_pool_checked_out", "Connections currently checked out of the pool", ("pool",)
+))
+db_pool_overflow = registry.register(Gauge(
+    "db_pool_overflow", "Connections opened above pool_size (negative while the pool is not full)", ("pool",)
+))
+db_pool_wait_seconds = registry.register(Histogram(
+    "db_pool_wait_seconds", "Time spent acquiring a connection from the pool", ("pool",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+))
+password_hash_queue_depth = registry.register(Gauge(
+    "password_hash_queue_depth", "bcrypt operations waiting for a free worker thread"
+))
+bookings_created_total = registry.register(Counter(
+    "bookings_created_total", "Appointments created"
+))
+booking_conflicts_total = registry.register(Counter(
+    "booking_conflicts_total", "Bookings and reschedules rejected with 409 because the master is busy", ("operation",)
+))
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Пул соединений, измеряющий время ожидания соединения"""
+
+    metrics_label = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_wait_seconds.observe(time.perf_counter() - started, pool=self.metrics_label)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_label = self.metrics_label
+        return pool
+
+
+def register_pool_metrics(engine, label: str = "primary") -> None:
+    """
+    Показатели пула движка в /metrics
+
+    Пул читается из движка при каждом снятии метрик: после engine.dispose() он пересоздаётся.
+    """
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.metrics_label = label
+    db_pool_size.set_function(lambda: engine.pool.size(), pool=label)
+    db_pool_checked_out.set_function(lambda: engine.pool.checkedout(), pool=label)
+    db_pool_overflow.set_function(lambda: engine.pool.overflow(), pool=label)
+
+
+class MetricsMiddleware:
+    """ASGI middleware: число и длительность HTTP-запросов по шаблону маршрута"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # шаблон пути вместо самого пути, чтобы ID не порождали новые ряды
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            http_requests_total.inc(method=scope["method"], route=route_path, status=status_code)
+            http_request_duration_seconds.observe(
+                time.perf_counter() - started, method=scope["method"], route=route_path
+            )
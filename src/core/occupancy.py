@@ -0,0 +1,191 @@
+import time as _time
+from collections import OrderedDict
+from datetime import datetime, date, time, timedelta
+
+from .cache_backend import cache_backend
+
+
+MINUTES_PER_DAY = 24 * 60
+OCCUPANCY_TTL_SECONDS = 300
+OCCUPANCY_MAX_ENTRIES = 50_000
+
+
+def minute_of_day(moment: datetime, day: date) -> int:
+    """Минута дня day, обрезанная до границ [0, 1440]"""
+    delta = moment - datetime.combine(day, time(0, 0))
+    minutes = int(delta.total_seconds() // 60)
+    return max(0, min(MINUTES_PER_DAY, minutes))
+
+
+def range_mask(start_minute: int, end_minute: int) -> int:
+    """Маска с единицами в битах [start_minute, end_minute)"""
+    if end_minute <= start_minute:
+        return 0
+    return ((1 << (end_minute - start_minute)) - 1) << start_minute
+
+
+def interval_mask(start: datetime, end: datetime, day: date) -> int:
+    """Маска минут дня day, которые покрывает интервал [start, end)"""
+    return range_mask(minute_of_day(start, day), minute_of_day(end, day))
+
+
+def days_between(start: datetime, end: datetime) -> list[date]:
+    """Дни, которые затрагивает интервал [start, end)"""
+    days = []
+    day = start.date()
+    while datetime.combine(day, time(0, 0)) < end:
+        days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def free_run_starts(free: int, length: int) -> int:
+    """
+    Маска позиций, с которых начинается свободный отрезок длиной length минут
+
+    Бит i результата установлен, если установлены все биты i..i+length-1 в free.
+    Сдвиги удваиваются, поэтому нужно O(log length) операций над числом.
+    """
+    runs = free
+    covered = 1
+    while covered < length:
+        shift = min(covered, length - covered)
+        runs &= runs >> shift
+        covered += shift
+    return runs
+
+
+class OccupancyIndex:
+    """
+    Битовые карты занятости мастеров по дням
+
+    Ключ — (master_id, salon_id, день), значение — целое число, в котором бит i
+    означает, что минута i этого дня занята активной записью. Карты строятся из
+    таблицы appointments при первом обращении и дальше поддерживаются
+    операциями записи (occupy/release), поэтому поиск слотов не обращается к
+    записям на каждый запрос. Изменения рассылаются через backend, и другие
+    процессы применяют их к своим картам.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = OCCUPANCY_TTL_SECONDS,
+        max_entries: int = OCCUPANCY_MAX_ENTRIES,
+        backend=cache_backend,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._maps: OrderedDict[tuple[int, int, date], tuple[int, float]] = OrderedDict()
+        # растёт при каждом изменении; загрузка, во время которой были изменения, не кэшируется
+        self.version = 0
+        # время последнего изменения по ключам — для загрузок с отстающей реплики
+        self._changed_at: OrderedDict[tuple[int, int, date], float] = OrderedDict()
+        self.backend = backend
+        backend.subscribe("occupancy", self._on_remote_change)
+
+    def get(self, master_id: int, salon_id: int, day: date) -> int | None:
+        """Карта занятости или None, если её нет в кэше или она устарела"""
+        key = (master_id, salon_id, day)
+        entry = self._maps.get(key)
+        if entry is None:
+            return None
+        bitmap, loaded_at = entry
+        if _time.monotonic() - loaded_at > self.ttl_seconds:
+            del self._maps[key]
+            return None
+        self._maps.move_to_end(key)
+        return bitmap
+
+    def put(
+        self,
+        master_id: int,
+        salon_id: int,
+        day: date,
+        bitmap: int,
+        loaded_version: int,
+        max_lag: float = 0.0,
+    ) -> None:
+        """
+        Сохранение карты, построенной из БД
+
+        Args:
+            loaded_version: значение version до запроса к БД; если с тех пор были
+                изменения, карта могла их не увидеть и не сохраняется
+            max_lag: допустимое отставание источника (реплики) в секундах; карта дня,
+                изменённого за это время, тоже не сохраняется
+        """
+        if loaded_version != self.version:
+            return
+        key = (master_id, salon_id, day)
+        changed_at = self._changed_at.get(key)
+        if max_lag and changed_at is not None and _time.monotonic() - changed_at < max_lag:
+            return
+        self._maps[key] = (bitmap, _time.monotonic())
+        self._maps.move_to_end((master_id, salon_id, day))
+        while len(self._maps) > self.max_entries:
+            self._maps.popitem(last=False)
+
+    def occupy(self, master_id: int, salon_id: int, start: datetime, end: datetime) -> None:
+        """Отметить интервал новой записи занятым (вызывать после commit)"""
+        self._occupy(master_id, salon_id, start, end)
+        self._publish("occupy", master_id, salon_id, start, end)
+
+    def release(self, master_id: int, salon_id: int, start: datetime, end: datetime) -> None:
+        """
+        Освободить интервал отменённой записи (вызывать после commit)
+
+        Карты затронутых дней сбрасываются, а не очищаются по битам: старые данные
+        могут содержать пересекающиеся записи, и снятие битов освободило бы чужое время.
+        """
+        self._release(master_id, salon_id, start, end)
+        self._publish("release", master_id, salon_id, start, end)
+
+    def _occupy(self, master_id: int, salon_id: int, start: datetime, end: datetime) -> None:
+        self.version += 1
+        for day in days_between(start, end):
+            key = (master_id, salon_id, day)
+            self._mark_changed(key)
+            entry = self._maps.get(key)
+            if entry is not None:
+                self._maps[key] = (entry[0] | interval_mask(start, end, day), entry[1])
+
+    def _release(self, master_id: int, salon_id: int, start: datetime, end: datetime) -> None:
+        self.version += 1
+        for day in days_between(start, end):
+            self._mark_changed((master_id, salon_id, day))
+            self._maps.pop((master_id, salon_id, day), None)
+
+    def _mark_changed(self, key: tuple[int, int, date]) -> None:
+        self._changed_at.pop(key, None)
+        self._changed_at[key] = _time.monotonic()
+        while len(self._changed_at) > self.max_entries:
+            self._changed_at.popitem(last=False)
+
+    def _publish(self, operation: str, master_id: int, salon_id: int, start: datetime, end: datetime) -> None:
+        self.backend.publish({
+            "ns": "occupancy",
+            "op": operation,
+            "master_id": master_id,
+            "salon_id": salon_id,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+        })
+
+    def _on_remote_change(self, message: dict | None) -> None:
+        if message is None:
+            self.clear()
+            return
+        apply = self._occupy if message["op"] == "occupy" else self._release
+        apply(
+            message["master_id"],
+            message["salon_id"],
+            datetime.fromisoformat(message["start"]),
+            datetime.fromisoformat(message["end"]),
+        )
+
+    def clear(self) -> None:
+        self.version += 1
+        self._maps.clear()
+
+
+occupancy_index = OccupancyIndex()
@@ -0,0 +1,95 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def encode_cursor(scope: str, values: list) -> str:
+    """
+    Непрозрачный курсор: значения ключа сортировки последней строки страницы
+
+    Args:
+        scope: сортировка, для которой выдан курсор (с другой сортировкой курсор не принимается)
+        values: значения столбцов ключа
+    """
+    payload = {
+        "s": scope,
+        "v": [value.isoformat() if isinstance(value, (date, datetime)) else value for value in values],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, scope: str, columns: list) -> list:
+    """
+    Значения ключа из курсора, приведённые к типам столбцов
+
+    Raises:
+        HTTPException: 400, если курсор повреждён или выдан для другой сортировки
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload["s"] != scope or len(payload["v"]) != len(columns):
+            raise ValueError(cursor)
+        values = []
+        for column, value in zip(columns, payload["v"]):
+            python_type = column.type.python_type
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is date:
+                value = date.fromisoformat(value)
+            else:
+                value = python_type(value)
+            values.append(value)
+        return values
+    except (binascii.Error, ValueError, TypeError, KeyError, NotImplementedError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+async def keyset_page(
+    session: AsyncSession,
+    query: Select,
+    columns: list,
+    descending: bool,
+    limit: int,
+    cursor: str | None = None,
+    scope: str = "",
+) -> tuple[list, str | None]:
+    """
+    Страница результатов по ключу сортировки вместо OFFSET
+
+    Следующая страница начинается условием (ключ) < (ключ последней строки), поэтому
+    при индексе по столбцам ключа любая страница стоит столько же, сколько первая.
+    Последний столбец ключа должен быть уникальным (обычно id).
+
+    Args:
+        session: сессия БД
+        query: запрос с фильтрами, без сортировки и LIMIT
+        columns: столбцы ключа сортировки
+        descending: порядок по убыванию
+        limit: размер страницы
+        cursor: next_cursor предыдущей страницы
+        scope: сортировка (поле и порядок), к которой привязан курсор
+
+    Returns:
+        tuple: строки страницы и курсор следующей страницы (None, если это последняя)
+    """
+    if cursor:
+        after = tuple_(*columns)
+        values = tuple_(*decode_cursor(cursor, scope, columns))
+        query = query.where(after < values if descending else after > values)
+
+    query = query.order_by(*(column.desc() if descending else column.asc() for column in columns))
+    result = await session.execute(query.limit(limit + 1))
+    rows = result.scalars().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(scope, [getattr(rows[-1], column.key) for column in columns])
+    return rows, next_cursor
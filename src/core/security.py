@@ -9,8 +9,79 @@ from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
 from .database import AssyncSessionLocal
+from .cache import TTLCache
+from .cache_backend import cache_backend
+from .utils import get_setting
 from src.models import users as DBUser, admins as DBadmin
 
+# Загруженные пользователи/админы (вместе с salons) кэшируются на короткое время,
+# чтобы не ходить в БД на каждый авторизованный запрос. Сервисы, меняющие статус,
+# права или салоны, вызывают invalidate_*_principal после commit; сброс
+# рассылается другим процессам через cache_backend.
+PRINCIPAL_CACHE_TTL_SECONDS = get_setting("PRINCIPAL_CACHE_TTL_SECONDS", 30)
+PRINCIPAL_CACHE_MAXSIZE = get_setting("PRINCIPAL_CACHE_MAXSIZE", 10_000)
+
+
+class _PrincipalCache(TTLCache):
+    """
+    Кэш пользователей/админов с версией, как у CacheNamespace
+
+    Каждый сброс (delete, clear) увеличивает version; загрузка, начатая до
+    сброса, не кэшируется — она могла прочитать ещё не заблокированного
+    пользователя или админа с прежними салонами.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize, ttl)
+        self.version = 0
+
+    def delete(self, key) -> None:
+        self.version += 1
+        super().delete(key)
+
+    def clear(self) -> None:
+        self.version += 1
+        super().clear()
+
+    def put(self, key, value, loaded_version: int) -> None:
+        """
+        Args:
+            loaded_version: значение version до чтения из БД
+        """
+        if loaded_version == self.version:
+            self.set(key, value)
+
+
+user_principals = _PrincipalCache(maxsize=PRINCIPAL_CACHE_MAXSIZE, ttl=PRINCIPAL_CACHE_TTL_SECONDS)
+admin_principals = _PrincipalCache(maxsize=PRINCIPAL_CACHE_MAXSIZE, ttl=PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+_principal_caches = {"user": user_principals, "admin": admin_principals}
+
+
+def invalidate_user_principal(user_id: int) -> None:
+    user_principals.delete(user_id)
+    cache_backend.publish({"ns": "principals", "kind": "user", "id": user_id})
+
+
+def invalidate_admin_principal(admin_id: int) -> None:
+    admin_principals.delete(admin_id)
+    cache_backend.publish({"ns": "principals", "kind": "admin", "id": admin_id})
+
+
+def _on_remote_principal_invalidate(message: dict | None) -> None:
+    if message is None:
+        user_principals.clear()
+        admin_principals.clear()
+        return
+    principals = _principal_caches.get(message.get("kind"))
+    if principals is not None:
+        principals.delete(message.get("id"))
+
+
+cache_backend.subscribe("principals", _on_remote_principal_invalidate)
+
+
 oauth2_scheme_admin = OAuth2PasswordBearer(
     tokenUrl="/admin/signin",
     scheme_name="AdminAuth"
@@ -40,13 +111,19 @@ async def get_user_id_from_token(token = Depends(oauth2_scheme_user)):
 
 
 async def get_user_from_id(user_id: str = Depends(get_user_id_from_token)):
-    async with AssyncSessionLocal() as session:
-        stmt  = select(DBUser).where(DBUser.id == user_id)
-        result = await session.execute(stmt)
-        user = result.scalar_one_or_none()
+    user = user_principals.get(user_id)
+    if user is None:
+        loaded_version = user_principals.version
+        async with AssyncSessionLocal() as session:
+            stmt  = select(DBUser).where(DBUser.id == user_id)
+            result = await session.execute(stmt)
+            user = result.scalar_one_or_none()
         if not user:
             raise HTTPException(status_code=401, detail="Ошибка авторизации")
-        return user
+        user_principals.put(user_id, user, loaded_version)
+    if not user.is_active:
+        raise HTTPException(status_code=403, detail="your accaunt has been baned")
+    return user
 
 
 async def get_admin_id_from_token(token = Depends(oauth2_scheme_admin)):
@@ -62,15 +139,19 @@ async def get_admin_id_from_token(token = Depends(oauth2_scheme_admin)):
 
 
 async def get_admin_from_id(admin_id: str = Depends(get_admin_id_from_token)):
-    async with AssyncSessionLocal() as session:
-        stmt  = select(DBadmin).where(DBadmin.id == admin_id).options(selectinload(DBadmin.salons))
-        result = await session.execute(stmt)
-        admin = result.scalar_one_or_none()
+    admin = admin_principals.get(admin_id)
+    if admin is None:
+        loaded_version = admin_principals.version
+        async with AssyncSessionLocal() as session:
+            stmt  = select(DBadmin).where(DBadmin.id == admin_id).options(selectinload(DBadmin.salons))
+            result = await session.execute(stmt)
+            admin = result.scalar_one_or_none()
         if not admin:
             raise HTTPException(status_code=401, detail="Ошибка авторизации")
-        if not admin.is_active:
-            raise HTTPException(status_code=403, detail="your accaunt has been baned")
-        return admin
+        admin_principals.put(admin_id, admin, loaded_version)
+    if not admin.is_active:
+        raise HTTPException(status_code=403, detail="your accaunt has been baned")
+    return admin
 
 
 async def get_super_admin_from_id(admin: DBadmin = Depends(get_admin_from_id)):
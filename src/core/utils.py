@@ -1,16 +1,84 @@
+import os
 import bcrypt, asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+
+from . import config
+from .metrics import password_hash_queue_depth
+
+
+def get_setting(name: str, default):
+    """
+    Значение настройки: атрибут src.core.config, затем переменная окружения, затем default
+
+    Строковые значения из окружения приводятся к типу default.
+    """
+    value = getattr(config, name, None)
+    if value is None:
+        value = os.getenv(name)
+    if value is None:
+        return default
+    if isinstance(default, bool) and isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    if default is not None and not isinstance(value, type(default)):
+        return type(default)(value)
+    return value
+
+
+BCRYPT_ROUNDS = get_setting("BCRYPT_ROUNDS", 12)
+PASSWORD_HASH_WORKERS = get_setting("PASSWORD_HASH_WORKERS", 2)
+PASSWORD_HASH_QUEUE_LIMIT = get_setting("PASSWORD_HASH_QUEUE_LIMIT", 32)
+
+# bcrypt отпускает GIL, поэтому потоков достаточно, чтобы не блокировать event loop
+_password_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+_password_tasks = 0
+
+
+def password_queue_depth() -> int:
+    """Количество операций хеширования, ожидающих свободного потока"""
+    return max(0, _password_tasks - PASSWORD_HASH_WORKERS)
+
+
+password_hash_queue_depth.set_function(password_queue_depth)
+
+
+def _password_task_done() -> None:
+    global _password_tasks
+    _password_tasks -= 1
+
+
+async def _run_password_task(func, *args):
+    global _password_tasks
+    if _password_tasks >= PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, try again later",
+            headers={"Retry-After": "1"}
+        )
+    loop = asyncio.get_running_loop()
+    future = _password_executor.submit(func, *args)
+    _password_tasks += 1
+    # счётчик уменьшается, когда задача действительно закончилась в потоке (или
+    # была снята из очереди), а не когда ожидающий запрос отменён: при обрыве
+    # соединения bcrypt продолжает выполняться и занимает поток
+    future.add_done_callback(lambda _: loop.call_soon_threadsafe(_password_task_done))
+    return await asyncio.wrap_future(future)
 
 
 async def hashing_password(password: str) -> str:
 
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
 
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
+    hashed = await _run_password_task(bcrypt.hashpw, password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
 
 async def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    return await _run_password_task(bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8'))
 
 
 
@@ -1,13 +1,28 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.api import auth, appointments, barbers, admin, reviews
+from src.api import auth, appointments, barbers, admin, reviews, exports, reports
+from src.core.cache_backend import cache_backend
+from src.core.instrumentation import QueryStatsMiddleware
+from src.core.metrics import MetricsMiddleware, registry
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # подписка на инвалидации кэшей из других воркеров
+    await cache_backend.start()
+    yield
+    await cache_backend.close()
 
 
 app = FastAPI(
     title="Style and Barber API",
     description="Система онлайн-записи для салонов красоты",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 
@@ -17,7 +32,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Server-Timing", "X-DB-Queries"],
 )
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 
 app.include_router(auth.router)
@@ -26,7 +44,15 @@ app.include_router(barbers.router)
 app.include_router(admin.router)
 app.include_router(reviews.router)
 app.include_router(reviews.admin_router)
+app.include_router(exports.router)
+app.include_router(reports.router)
 
 @app.get("/")
 async def root():
-    return {"message": "Style and Barber API"}
\ No newline at end of file
+    return {"message": "Style and Barber API"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Метрики в текстовом формате Prometheus"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -14,6 +14,8 @@ from .master_service import master_service
 from .admin_salon import admin_salon
 from .service_salon import service_salon
 from .review import reviews
+from .rating_summary import rating_summaries
+from .booking_rollup import booking_daily_rollups
 
 __all__ = [
     "Base",
@@ -30,6 +32,8 @@ __all__ = [
     "service_category",
     "service_salon",
     "reviews",
+    "rating_summaries",
+    "booking_daily_rollups",
     "salon_schedules",
     "master_schedules"
 ]
\ No newline at end of file
@@ -1,7 +1,8 @@
 from enum import Enum as _enum
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, String, Enum
+from sqlalchemy import ForeignKey, String, Enum, Index, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .Base import Base, BaseMixin
@@ -14,8 +15,28 @@ class AppointmentStatus(_enum):
     cancelled = "cancelled"
     no_show = "no_show"
 
+
+BOOKING_OVERLAP_CONSTRAINT = "ex_appointments_master_time_overlap"
+
+
 class appointments(Base, BaseMixin):
     __tablename__ = "appointments"
+    __table_args__ = (
+        # занятость мастера: поиск слотов и проверка пересечений
+        Index("ix_appointments_master_active_time", "master_id", "is_active", "date_time", "end_time"),
+        # журнал записей салона: постраничный вывод по (date_time, id)
+        Index("ix_appointments_salon_time_id", "salon_id", "date_time", "id"),
+        # записи клиента
+        Index("ix_appointments_client_active_time", "client_id", "is_active", "date_time"),
+        # активные записи одного мастера не пересекаются по времени (btree_gist)
+        ExcludeConstraint(
+            ("master_id", "="),
+            (text("tsrange(date_time, end_time)"), "&&"),
+            name=BOOKING_OVERLAP_CONSTRAINT,
+            using="gist",
+            where=text("is_active"),
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     client_id:Mapped[int] = mapped_column(ForeignKey("users.id"))
@@ -27,6 +48,7 @@ class appointments(Base, BaseMixin):
     status: Mapped[AppointmentStatus] = mapped_column(Enum(AppointmentStatus), default=AppointmentStatus.confirmed)
     comment:Mapped[str] = mapped_column(String(300))
     reason_for_deletion: Mapped[str | None]
+    price: Mapped[int | None]  # цена услуги на момент записи (персональная цена мастера или базовая)
 
 
     client = relationship("users", back_populates="appointments")
@@ -0,0 +1,26 @@
+from datetime import date
+
+from sqlalchemy import ForeignKey, Index, PrimaryKeyConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .Base import Base
+
+
+class booking_daily_rollups(Base):
+    """Итоги записей за день по салону, мастеру и услуге (для отчётов)"""
+
+    __tablename__ = "booking_daily_rollups"
+    __table_args__ = (
+        PrimaryKeyConstraint("salon_id", "master_id", "service_id", "day", name="pk_booking_daily_rollups"),
+        # отчёты салона за период
+        Index("ix_booking_daily_rollups_salon_day", "salon_id", "day"),
+    )
+
+    salon_id: Mapped[int] = mapped_column(ForeignKey("salons.id"))
+    master_id: Mapped[int] = mapped_column(ForeignKey("masters.id"))
+    service_id: Mapped[int] = mapped_column(ForeignKey("services.id"))
+    day: Mapped[date]
+    bookings: Mapped[int] = mapped_column(default=0)  # активные записи
+    booked_minutes: Mapped[int] = mapped_column(default=0)
+    revenue: Mapped[int] = mapped_column(default=0)  # по цене мастера, иначе базовой
+    cancellations: Mapped[int] = mapped_column(default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import  ForeignKey, PrimaryKeyConstraint, UniqueConstraint
+from sqlalchemy import  ForeignKey, PrimaryKeyConstraint, UniqueConstraint, Index
 from sqlalchemy.orm import  Mapped, mapped_column
 
 from .Base import Base
@@ -9,6 +9,8 @@ class master_salon(Base):
     __table_args__ = (
         PrimaryKeyConstraint("master_id", "salon_id", name="pk_master_salon"),
         UniqueConstraint("master_id", "salon_id", name="uq_master_salon_pair"),
+        # обратный поиск: мастера салона
+        Index("ix_master_salon_salon_master", "salon_id", "master_id"),
     )
     master_id: Mapped[int] = mapped_column(ForeignKey("masters.id"))
     salon_id: Mapped[int] = mapped_column(ForeignKey("salons.id"))
@@ -1,7 +1,7 @@
 from datetime import time
 from sqlalchemy import ForeignKey, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import  ForeignKey, PrimaryKeyConstraint, UniqueConstraint
+from sqlalchemy import  ForeignKey, PrimaryKeyConstraint, UniqueConstraint, Index
 
 from .Base import Base, BaseMixin
 
@@ -12,6 +12,7 @@ class master_schedules(Base, BaseMixin):
     __table_args__ = (
         PrimaryKeyConstraint("master_id", "salon_id", "day_of_week", name="pk_master_salon_day_of_week"),
         UniqueConstraint("master_id", "salon_id", "day_of_week", name="uq_master_salon_day_of_week_pair"),
+        Index("ix_master_schedules_salon_day", "salon_id", "day_of_week"),
     )
     # id: Mapped[int] = mapped_column(primary_key=True)
     master_id: Mapped[int] = mapped_column(ForeignKey("masters.id"))
@@ -1,4 +1,4 @@
-from sqlalchemy import  ForeignKey, PrimaryKeyConstraint
+from sqlalchemy import  ForeignKey, PrimaryKeyConstraint, Index
 from sqlalchemy.orm import  Mapped, mapped_column
 
 from .Base import Base
@@ -8,6 +8,8 @@ class master_service(Base):
     __tablename__ = "master_service"
     __table_args__ = (
         PrimaryKeyConstraint("master_id", "service_id", name="pk_master_service"),
+        # обратный поиск: мастера, оказывающие услугу
+        Index("ix_master_service_service_master", "service_id", "master_id"),
     )
     master_id: Mapped[int] = mapped_column(ForeignKey("masters.id"))
     service_id: Mapped[int] = mapped_column(ForeignKey("services.id"))
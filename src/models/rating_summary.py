@@ -0,0 +1,23 @@
+from sqlalchemy import String, PrimaryKeyConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .Base import Base
+
+
+class rating_summaries(Base):
+    """Накопленная статистика активных отзывов мастера или салона"""
+
+    __tablename__ = "rating_summaries"
+    __table_args__ = (
+        PrimaryKeyConstraint("entity_type", "entity_id", name="pk_rating_summaries"),
+    )
+
+    entity_type: Mapped[str] = mapped_column(String(16))  # "master" или "salon"
+    entity_id: Mapped[int]
+    rating_sum: Mapped[int] = mapped_column(default=0)
+    reviews_count: Mapped[int] = mapped_column(default=0)
+    one_star: Mapped[int] = mapped_column(default=0)
+    two_star: Mapped[int] = mapped_column(default=0)
+    three_star: Mapped[int] = mapped_column(default=0)
+    four_star: Mapped[int] = mapped_column(default=0)
+    five_star: Mapped[int] = mapped_column(default=0)
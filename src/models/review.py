@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, Integer, Text, Boolean
+from sqlalchemy import ForeignKey, Integer, Text, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .Base import Base, BaseMixin
@@ -8,6 +8,16 @@ class reviews(Base, BaseMixin):
     """Модель отзыва о мастере или салоне"""
     
     __tablename__ = "reviews"
+    __table_args__ = (
+        # (..., created_at | rating, id) — ключ постраничного вывода отзывов без OFFSET;
+        # is_active не входит в индекс: админский список по нему не фильтрует, а
+        # публичный отбрасывает удалённые отзывы при чтении строк по порядку индекса
+        Index("ix_reviews_master_created", "master_id", "created_at", "id"),
+        Index("ix_reviews_salon_created", "salon_id", "created_at", "id"),
+        Index("ix_reviews_created", "created_at", "id"),
+        Index("ix_reviews_master_rating", "master_id", "rating", "id"),
+        Index("ix_reviews_salon_rating", "salon_id", "rating", "id"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
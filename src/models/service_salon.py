@@ -1,4 +1,4 @@
-from sqlalchemy import  ForeignKey, PrimaryKeyConstraint, UniqueConstraint
+from sqlalchemy import  ForeignKey, PrimaryKeyConstraint, UniqueConstraint, Index
 from sqlalchemy.orm import  Mapped, mapped_column
 
 from .Base import Base
@@ -9,6 +9,8 @@ class service_salon(Base):
     __table_args__ = (
         PrimaryKeyConstraint("service_id", "salon_id", name="pk_service_salon"),
         UniqueConstraint("service_id", "salon_id", name="uq_service_salon_pair"),
+        # обратный поиск: услуги салона
+        Index("ix_service_salon_salon_service", "salon_id", "service_id"),
     )
     salon_id: Mapped[int] = mapped_column(ForeignKey("salons.id"))
     service_id: Mapped[int] = mapped_column(ForeignKey("services.id"))
@@ -5,7 +5,7 @@ from .salon import SalonCreate, SalonEdit, SalonResponse
 from .service import ServiceCreate, ServiceEdit
 from .master import MasterEdit, MasterResponse
 from .schedule import ScheduleCreate, DaySchedule
-from .review import ReviewCreate, ReviewUpdate, ReviewResponse, RatingStatsResponse
+from .review import ReviewCreate, ReviewUpdate, ReviewResponse, ReviewPage, RatingStatsResponse
 
 __all__ = [
     "User",
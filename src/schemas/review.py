@@ -45,6 +45,12 @@ class ReviewResponse(BaseModel):
         from_attributes = True
 
 
+class ReviewPage(BaseModel):
+    """Страница отзывов; next_cursor передаётся в cursor для получения следующей"""
+    items: list[ReviewResponse]
+    next_cursor: Optional[str] = None
+
+
 class RatingStatsResponse(BaseModel):
     """Статистика рейтинга для мастера/салона"""
     average_rating: float
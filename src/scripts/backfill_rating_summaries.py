@@ -0,0 +1,22 @@
+"""
+Пересчёт таблицы rating_summaries по активным отзывам
+
+Запуск: python -m src.scripts.backfill_rating_summaries
+"""
+import asyncio
+
+from src.core.cache_backend import cache_backend
+from src.core.database import AssyncSessionLocal
+from src.services.review_service import ReviewService
+
+
+async def main():
+    async with AssyncSessionLocal() as session:
+        written = await ReviewService(session).rebuild_rating_summaries()
+    print(f"rating_summaries rebuilt: {written} rows")
+    # дождаться рассылки инвалидации, чтобы работающие воркеры сбросили рейтинги
+    await cache_backend.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,201 @@
+"""
+Планы горячих запросов с составными индексами и без них (PostgreSQL)
+
+Скрипт создаёт временные копии таблиц (CREATE TEMP TABLE ... LIKE ... INCLUDING ALL),
+которые в search_path перекрывают настоящие, заполняет их синтетическими данными,
+выполняет EXPLAIN ANALYZE с индексами, затем удаляет индексы и повторяет. Всё
+выполняется в одной транзакции и откатывается — рабочие данные не меняются.
+
+Запуск (после alembic upgrade head): python -m src.scripts.explain_indexes [--rows 200000]
+"""
+import argparse
+import asyncio
+import json
+from datetime import datetime
+
+from sqlalchemy import text
+
+from src.core.database import engine
+
+
+TABLES = ["appointments", "reviews", "master_schedules", "master_salon", "master_service", "service_salon"]
+
+SALONS = 50
+MASTERS = 500
+SERVICES = 40
+CLIENTS = 20_000
+BASE_TIME = datetime(2026, 1, 1, 9, 0)
+
+SEED = [
+    # записи не пересекаются: у каждого мастера по записи в час
+    """
+    INSERT INTO appointments (id, client_id, salon_id, master_id, service_id, date_time, end_time,
+                              status, comment, is_active, created_at)
+    SELECT n, n % :clients + 1, (n % :masters) % :salons + 1, n % :masters + 1, n % :services + 1,
+           :base + (n / :masters) * interval '1 hour',
+           :base + (n / :masters) * interval '1 hour' + interval '45 minutes',
+           'confirmed', '', n % 10 <> 0, :base
+    FROM generate_series(1, :rows) AS n
+    """,
+    """
+    INSERT INTO reviews (id, user_id, master_id, salon_id, appointment_id, rating, is_moderated,
+                         is_active, created_at)
+    SELECT n, n % :clients + 1, CASE WHEN n % 2 = 0 THEN n % :masters + 1 END,
+           CASE WHEN n % 2 = 1 THEN n % :salons + 1 END, n, n % 5 + 1, true, n % 7 <> 0,
+           :base + n * interval '1 minute'
+    FROM generate_series(1, :rows / 4) AS n
+    """,
+    """
+    INSERT INTO master_salon (master_id, salon_id)
+    SELECT m, m % :salons + 1 FROM generate_series(1, :masters) AS m
+    """,
+    """
+    INSERT INTO master_schedules (master_id, salon_id, day_of_week, start_time, end_time, is_working,
+                                  is_active, created_at)
+    SELECT m, m % :salons + 1, d, '09:00', '21:00', true, true, :base
+    FROM generate_series(1, :masters) AS m, generate_series(0, 6) AS d
+    """,
+    """
+    INSERT INTO master_service (master_id, service_id)
+    SELECT m, s FROM generate_series(1, :masters) AS m, generate_series(1, :services) AS s
+    WHERE (m + s) % 4 = 0
+    """,
+    """
+    INSERT INTO service_salon (service_id, salon_id)
+    SELECT s, l FROM generate_series(1, :services) AS s, generate_series(1, :salons) AS l
+    """,
+]
+
+QUERIES = {
+    "slot occupancy (SlotEngine)": """
+        SELECT master_id, date_time, end_time FROM appointments
+        WHERE salon_id = 3 AND master_id IN (3, 53, 103) AND is_active
+          AND date_time < :base + interval '8 days' AND end_time > :base + interval '7 days'
+    """,
+    "master overlap check": """
+        SELECT id FROM appointments
+        WHERE master_id = 42 AND is_active
+          AND date_time < :base + interval '30 days 1 hour' AND end_time > :base + interval '30 days'
+    """,
+    "client appointments": """
+        SELECT * FROM appointments WHERE client_id = 77 AND is_active ORDER BY date_time DESC
+    """,
+    "salon journal, deep page": """
+        SELECT * FROM appointments
+        WHERE salon_id = 7 AND date_time >= :base AND date_time < :base + interval '365 days'
+          AND (date_time, id) < (:base + interval '200 days', 100000)
+        ORDER BY date_time DESC, id DESC LIMIT 51
+    """,
+    "master rating": "SELECT avg(rating), count(*) FROM reviews WHERE master_id = 42 AND is_active",
+    "salon rating": "SELECT avg(rating), count(*) FROM reviews WHERE salon_id = 7 AND is_active",
+    "master reviews, deep page": """
+        SELECT * FROM reviews
+        WHERE master_id = 42 AND is_active AND (created_at, id) < (:base + interval '1000 minutes', 1000)
+        ORDER BY created_at DESC, id DESC LIMIT 21
+    """,
+    "salon reviews by rating, deep page": """
+        SELECT * FROM reviews
+        WHERE salon_id = 7 AND is_active AND (rating, id) > (3, 1000)
+        ORDER BY rating, id LIMIT 21
+    """,
+    "admin master reviews, deep page": """
+        SELECT * FROM reviews
+        WHERE master_id = 42 AND (created_at, id) < (:base + interval '1000 minutes', 1000)
+        ORDER BY created_at DESC, id DESC LIMIT 51
+    """,
+    "admin salon reviews by rating, deep page": """
+        SELECT * FROM reviews
+        WHERE salon_id = 7 AND (rating, id) > (3, 1000)
+        ORDER BY rating, id LIMIT 51
+    """,
+    "salon schedules of the day": "SELECT * FROM master_schedules WHERE salon_id = 7 AND day_of_week = 2",
+    "masters of salon": "SELECT master_id FROM master_salon WHERE salon_id = 7",
+    "masters of service": "SELECT master_id FROM master_service WHERE service_id = 12",
+    "services of salon": "SELECT service_id FROM service_salon WHERE salon_id = 7",
+}
+
+
+def _scan_nodes(plan: dict) -> list[str]:
+    """Узлы доступа к таблицам в плане (тип сканирования и индекс) и сортировки"""
+    nodes = []
+    if plan["Node Type"] in ("Sort", "Incremental Sort"):
+        nodes.append(plan["Node Type"])
+    if "Relation Name" in plan:
+        node = plan["Node Type"]
+        if "Index Name" in plan:
+            node += f" using {plan['Index Name']}"
+        nodes.append(node)
+    for child in plan.get("Plans", []):
+        nodes.extend(_scan_nodes(child))
+    return nodes
+
+
+async def _explain(conn, params: dict) -> dict[str, tuple[list[str], float]]:
+    plans = {}
+    for name, query in QUERIES.items():
+        result = await conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {query}"), params)
+        raw = result.scalar()
+        plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+        plans[name] = (_scan_nodes(plan["Plan"]), plan["Execution Time"])
+    return plans
+
+
+async def _drop_secondary_indexes(conn) -> None:
+    """Удаление всех индексов временных таблиц, кроме первичных ключей"""
+    result = await conn.execute(text(
+        """
+        SELECT i.relname FROM pg_index x
+        JOIN pg_class i ON i.oid = x.indexrelid
+        JOIN pg_class t ON t.oid = x.indrelid
+        WHERE t.relname = ANY(:tables) AND t.relpersistence = 't'
+          AND NOT x.indisprimary AND NOT x.indisunique AND NOT x.indisexclusion
+        """
+    ), {"tables": TABLES})
+    for (index_name,) in result.all():
+        await conn.execute(text(f'DROP INDEX pg_temp."{index_name}"'))
+
+
+async def main(rows: int):
+    params = {
+        "rows": rows,
+        "clients": CLIENTS,
+        "masters": MASTERS,
+        "salons": SALONS,
+        "services": SERVICES,
+        "base": BASE_TIME,
+    }
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            for table in TABLES:
+                await conn.execute(text(
+                    f"CREATE TEMP TABLE {table} (LIKE public.{table} INCLUDING ALL) ON COMMIT DROP"
+                ))
+            for statement in SEED:
+                await conn.execute(text(statement), params)
+            for table in TABLES:
+                await conn.execute(text(f"ANALYZE {table}"))
+
+            with_indexes = await _explain(conn, params)
+            await _drop_secondary_indexes(conn)
+            for table in TABLES:
+                await conn.execute(text(f"ANALYZE {table}"))
+            without_indexes = await _explain(conn, params)
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+    print(f"rows: {rows}")
+    for name in QUERIES:
+        before_nodes, before_ms = without_indexes[name]
+        after_nodes, after_ms = with_indexes[name]
+        print(f"\n{name}")
+        print(f"  without indexes: {before_ms:8.3f} ms  {', '.join(before_nodes)}")
+        print(f"  with indexes:    {after_ms:8.3f} ms  {', '.join(after_nodes)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000, help="число синтетических записей")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows))
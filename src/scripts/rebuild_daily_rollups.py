@@ -0,0 +1,37 @@
+"""
+Пересчёт дневных итогов записей booking_daily_rollups из таблицы appointments
+
+Запуск:
+    python -m src.scripts.rebuild_daily_rollups                  # за всё время (первичное заполнение)
+    python -m src.scripts.rebuild_daily_rollups --days 7         # последние 7 дней и будущие записи
+    python -m src.scripts.rebuild_daily_rollups --date-from 2026-01-01 --date-to 2026-03-31
+
+Итоги поддерживаются путями записи, отмены и переноса; плановая сверка
+последних дней исправляет расхождения после ручных правок записей в БД,
+например по cron раз в ночь:
+
+    15 3 * * * cd /srv/style_and_barber && python -m src.scripts.rebuild_daily_rollups --days 7
+"""
+import argparse
+import asyncio
+from datetime import date, timedelta
+
+from src.core.database import AssyncSessionLocal
+from src.services.rollup_service import RollupService
+
+
+async def main(args):
+    date_from, date_to = args.date_from, args.date_to
+    if args.days is not None:
+        date_from = date.today() - timedelta(days=args.days)
+    async with AssyncSessionLocal() as session:
+        written = await RollupService(session).rebuild(date_from, date_to)
+    print(f"booking_daily_rollups rebuilt: {written} rows ({date_from or 'start'} .. {date_to or 'end'})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--date-from", type=date.fromisoformat, default=None, help="первый день (YYYY-MM-DD)")
+    parser.add_argument("--date-to", type=date.fromisoformat, default=None, help="последний день включительно")
+    parser.add_argument("--days", type=int, default=None, help="пересчитать последние N дней и все последующие")
+    asyncio.run(main(parser.parse_args()))
@@ -11,6 +11,7 @@ from src.models import (admins as DBadmin,
                         )
 from src.repository.base_repo import BaseRepository
 from src.core.utils import hashing_password
+from src.core.security import invalidate_admin_principal
 from src.schemas import AdminCreate, SalonEdit, SalonCreate, ServiceCreate, UserEdit, User, AdminEdit, MasterEdit
 
 
@@ -84,16 +85,17 @@ class AdminService:
             admin_to_delete.is_active = False
             admin_to_delete.reason_for_deletion = reason
 
-            
-            return {"status": "success",
-                    "message": f"Admin {admin_id} deactivated successfully.",
-                    "data": {
-                        "admin_id": admin_id,
-                        "is_active": False,
-                        "reason_for_deletion": reason,
-                        "changed_by_admin_id": admin_id
-                    },
-                }
+        invalidate_admin_principal(admin_id)
+
+        return {"status": "success",
+                "message": f"Admin {admin_id} deactivated successfully.",
+                "data": {
+                    "admin_id": admin_id,
+                    "is_active": False,
+                    "reason_for_deletion": reason,
+                    "changed_by_admin_id": admin_id
+                },
+            }
 
     async def update_admin(self, admin_id: int, admin_data: AdminEdit) -> dict:
         """Обновление администратора"""
@@ -140,19 +142,21 @@ class AdminService:
             result_salons = await self.session.execute(stmt_salons)
             salons = result_salons.scalars().all()
             admin_to_update.salons = salons
-            
-            return {
-                "message": "Admin updated successfully",
-                "admin": {
-                    "id": admin_to_update.id,
-                    "first_name": admin_to_update.first_name,
-                    "last_name": admin_to_update.last_name,
-                    "email": admin_to_update.email,
-                    "phone": admin_to_update.phone,
-                    "super_admin": admin_to_update.super_admin,
-                    "salons": [salon.id for salon in salons]
-                }
+
+        invalidate_admin_principal(admin_id)
+
+        return {
+            "message": "Admin updated successfully",
+            "admin": {
+                "id": admin_to_update.id,
+                "first_name": admin_to_update.first_name,
+                "last_name": admin_to_update.last_name,
+                "email": admin_to_update.email,
+                "phone": admin_to_update.phone,
+                "super_admin": admin_to_update.super_admin,
+                "salons": [salon.id for salon in salons]
             }
+        }
 
     async def get_all_admins(self) -> list[dict]:
         """Получение списка всех администраторов"""
@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime, date, time, timedelta
 from fastapi import HTTPException, status
 
@@ -9,11 +10,32 @@ from src.models import (
     masters as DBmaster,
     services as DBservice,
     master_salon as DBmaster_salon,
+    master_service as DBmaster_service,
     master_schedules as DBmaster_schedules,
     salon_schedules as DBsalon_schedules
 )
+from src.models.appointment import AppointmentStatus, BOOKING_OVERLAP_CONSTRAINT
 from src.schemas import AppointmentCreate
-from src.services import schedule_service
+from src.core.metrics import bookings_created_total, booking_conflicts_total
+from src.core.occupancy import occupancy_index
+from src.services.slot_engine import SlotEngine
+from src.services.rollup_service import RollupService, appointment_price
+
+
+def is_booking_conflict(error: IntegrityError) -> bool:
+    """Нарушено ли ограничение на пересечение записей мастера (exclusion_violation)"""
+    orig = error.orig
+    return (
+        getattr(orig, "sqlstate", None) == "23P01"
+        or BOOKING_OVERLAP_CONSTRAINT in str(orig)
+    )
+
+
+def booking_conflict_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="This time slot overlaps with another appointment"
+    )
 
 
 class AppointmentService:
@@ -21,7 +43,114 @@ class AppointmentService:
     
     def __init__(self, session: AsyncSession):
         self.session = session
-    
+
+    async def _flush_booking(self, appointment: DBappointment, operation: str) -> None:
+        """
+        flush новой или перенесённой записи с проверкой пересечений
+
+        В PostgreSQL пересечения отклоняет ограничение ex_appointments_master_time_overlap,
+        ответ — 409. На других СУБД ограничения нет, и пересечение проверяется запросом.
+
+        Args:
+            appointment: Новая или изменённая запись
+            operation: create или update — метка в метрике booking_conflicts_total
+        """
+        if self.session.get_bind().dialect.name != "postgresql" and await self._has_overlap(appointment):
+            conflict = True
+        else:
+            try:
+                await self.session.flush()
+                conflict = False
+            except IntegrityError as e:
+                if not is_booking_conflict(e):
+                    raise
+                conflict = True
+
+        if conflict:
+            booking_conflicts_total.inc(operation=operation)
+            raise booking_conflict_error()
+
+    async def _has_overlap(self, appointment: DBappointment) -> bool:
+        conditions = [
+            DBappointment.master_id == appointment.master_id,
+            DBappointment.date_time < appointment.end_time,
+            DBappointment.end_time > appointment.date_time,
+            DBappointment.is_active == True
+        ]
+        if appointment.id is not None:
+            conditions.append(DBappointment.id != appointment.id)
+
+        overlap_stmt = select(DBappointment.id).where(and_(*conditions)).limit(1)
+        with self.session.no_autoflush:
+            overlap_result = await self.session.execute(overlap_stmt)
+        return overlap_result.scalar_one_or_none() is not None
+
+    async def _load_booking_context(self, appointment_data: AppointmentCreate):
+        """
+        Всё, что нужно для проверки записи, одним запросом
+
+        От салона внешними соединениями подтягиваются мастер, его членство в салоне,
+        услуга с персональной ценой мастера и рабочие расписания мастера и салона на
+        день записи. Каждое соединение находит не больше одной строки.
+
+        Args:
+            appointment_data: Данные записи
+
+        Returns:
+            Row | None: (ID салона, ID мастера, ID салона из master_salon, услуга,
+                персональная цена, расписание мастера, расписание салона) или None,
+                если салона нет; отсутствующие части равны None
+        """
+        target_weekday = appointment_data.date_time.weekday()
+        context_stmt = (
+            select(
+                DBsalon.id,
+                DBmaster.id,
+                DBmaster_salon.salon_id,
+                DBservice,
+                DBmaster_service.personal_price,
+                DBmaster_schedules,
+                DBsalon_schedules
+            )
+            .select_from(DBsalon)
+            .outerjoin(DBmaster, DBmaster.id == appointment_data.master_id)
+            .outerjoin(
+                DBmaster_salon,
+                and_(
+                    DBmaster_salon.master_id == DBmaster.id,
+                    DBmaster_salon.salon_id == DBsalon.id
+                )
+            )
+            .outerjoin(DBservice, DBservice.id == appointment_data.service_id)
+            .outerjoin(
+                DBmaster_service,
+                and_(
+                    DBmaster_service.master_id == DBmaster.id,
+                    DBmaster_service.service_id == DBservice.id
+                )
+            )
+            .outerjoin(
+                DBmaster_schedules,
+                and_(
+                    DBmaster_schedules.master_id == DBmaster.id,
+                    DBmaster_schedules.salon_id == DBsalon.id,
+                    DBmaster_schedules.day_of_week == target_weekday,
+                    DBmaster_schedules.is_working == True
+                )
+            )
+            .outerjoin(
+                DBsalon_schedules,
+                and_(
+                    DBsalon_schedules.salon_id == DBsalon.id,
+                    DBsalon_schedules.day_of_week == target_weekday,
+                    DBsalon_schedules.is_working == True
+                )
+            )
+            .where(DBsalon.id == appointment_data.salon_id)
+        )
+        context_result = await self.session.execute(context_stmt)
+        return context_result.one_or_none()
+
     async def create_appointment(
         self, 
         appointment_data: AppointmentCreate, 
@@ -38,70 +167,42 @@ class AppointmentService:
             dict: Информация о созданной записи
         """
         async with self.session.begin():
-            salon_stmt = select(DBsalon).where(DBsalon.id == appointment_data.salon_id)
-            salon_result = await self.session.execute(salon_stmt)
-            salon = salon_result.scalar_one_or_none()
-            
-            if not salon:
+            context = await self._load_booking_context(appointment_data)
+            if context is None:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Salon not found"
                 )
-            
-            master_stmt = select(DBmaster).where(DBmaster.id == appointment_data.master_id)
-            master_result = await self.session.execute(master_stmt)
-            master = master_result.scalar_one_or_none()
-            
-            if not master:
+            _, master_id, member_salon_id, service, personal_price, master_schedule, salon_schedule = context
+
+            if master_id is None:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Master not found"
                 )
-            
-            service_stmt = select(DBservice).where(DBservice.id == appointment_data.service_id)
-            service_result = await self.session.execute(service_stmt)
-            service = service_result.scalar_one_or_none()
-            
-            if not service:
+
+            if member_salon_id is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="The master does not work in this salon"
+                )
+
+            if service is None:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Service not found"
                 )
             
             end_time = appointment_data.date_time + timedelta(minutes=service.duration_minutes)
-            
-            target_weekday = appointment_data.date_time.weekday()
-            master_schedule_stmt = select(DBmaster_schedules).where(
-                and_(
-                    DBmaster_schedules.master_id == appointment_data.master_id,
-                    DBmaster_schedules.salon_id == appointment_data.salon_id,
-                    DBmaster_schedules.day_of_week == target_weekday,
-                    DBmaster_schedules.is_working == True
-                )
-            )
-            master_schedule_result = await self.session.execute(master_schedule_stmt)
-            master_schedule = master_schedule_result.scalar_one_or_none()
+            price = personal_price if personal_price is not None else service.base_price
             
             # Если у мастера нет расписания для салона, использовать расписание салона
-            if not master_schedule:
-                salon_schedule_stmt = select(DBsalon_schedules).where(
-                    and_(
-                        DBsalon_schedules.salon_id == appointment_data.salon_id,
-                        DBsalon_schedules.day_of_week == target_weekday,
-                        DBsalon_schedules.is_working == True
-                    )
+            working_schedule = master_schedule or salon_schedule
+            if not working_schedule:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="The salon is not working on the selected day"
                 )
-                salon_schedule_result = await self.session.execute(salon_schedule_stmt)
-                salon_schedule = salon_schedule_result.scalar_one_or_none()
-                
-                if not salon_schedule:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="The salon is not working on the selected day"
-                    )
-                working_schedule = salon_schedule
-            else:
-                working_schedule = master_schedule
             
             appointment_time = appointment_data.date_time.time()
             appointment_end_time = end_time.time()
@@ -119,21 +220,6 @@ class AppointmentService:
                         detail="The appointment time overlaps with break time"
                     )
             
-            overlap_stmt = select(DBappointment).where(
-                and_(
-                    DBappointment.master_id == appointment_data.master_id,
-                    DBappointment.date_time < end_time,
-                    DBappointment.end_time > appointment_data.date_time,
-                    DBappointment.is_active == True
-                )
-            )
-            overlap_result = await self.session.execute(overlap_stmt)
-            if overlap_result.scalar_one_or_none():
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail="This time slot overlaps with another appointment"
-                )
-            
             appointment = DBappointment(
                 client_id=user_id,
                 salon_id=appointment_data.salon_id,
@@ -141,30 +227,35 @@ class AppointmentService:
                 service_id=appointment_data.service_id,
                 date_time=appointment_data.date_time,
                 end_time=end_time,
-                status=True,
-                comment=appointment_data.comment or ""
+                status=AppointmentStatus.confirmed,
+                comment=appointment_data.comment or "",
+                price=price
             )
             
             self.session.add(appointment)
-            await self.session.flush()
-            await self.session.refresh(appointment)
-            
-            return {
-                "status": "success",
-                "message": "Appointment created successfully",
-                "data": {
-                    "id": appointment.id,
-                    "client_id": appointment.client_id,
-                    "salon_id": appointment.salon_id,
-                    "master_id": appointment.master_id,
-                    "service_id": appointment.service_id,
-                    "date_time": appointment.date_time.isoformat(),
-                    "end_time": appointment.end_time.isoformat(),
-                    "status": appointment.status,
-                    "comment": appointment.comment,
-                    "created_at": appointment.created_at.isoformat()
-                },
-            }
+            await self._flush_booking(appointment, "create")
+            await RollupService(self.session).record(appointment, bookings=1)
+
+        occupancy_index.occupy(appointment.master_id, appointment.salon_id, appointment.date_time, appointment.end_time)
+        bookings_created_total.inc()
+
+        return {
+            "status": "success",
+            "message": "Appointment created successfully",
+            "data": {
+                "id": appointment.id,
+                "client_id": appointment.client_id,
+                "salon_id": appointment.salon_id,
+                "master_id": appointment.master_id,
+                "service_id": appointment.service_id,
+                "date_time": appointment.date_time.isoformat(),
+                "end_time": appointment.end_time.isoformat(),
+                "status": appointment.status,
+                "price": price,
+                "comment": appointment.comment,
+                "created_at": appointment.created_at.isoformat()
+            },
+        }
     
     async def delete_appointment(
         self, 
@@ -184,7 +275,8 @@ class AppointmentService:
             dict: Сообщение об успехе
         """
         async with self.session.begin():
-            stmt = select(DBappointment).where(DBappointment.id == appointment_id)
+            # блокировка строки: повторная отмена или перенос ждут и видят is_active после нас
+            stmt = select(DBappointment).where(DBappointment.id == appointment_id).with_for_update()
             result = await self.session.execute(stmt)
             appointment = result.scalar_one_or_none()
             
@@ -209,21 +301,73 @@ class AppointmentService:
             appointment.is_active = False
             appointment.status = "cancelled"
             appointment.comment = f"{appointment.comment}\n[Deleted] Reason: {reason}" if appointment.comment else f"[Deleted] Reason: {reason}"
-            
-            return {
-                "status": "success",
-                "message": "Appointment deleted successfully",
-                "data": {
-                    "id": appointment.id,
-                    "salon_id": appointment.salon_id,
-                    "master_id": appointment.master_id,
-                    "service_id": appointment.service_id,
-                    "date_time": appointment.date_time.isoformat(),
-                    "end_time": appointment.end_time.isoformat(),
-                    "status": appointment.status,
-                    "comment": appointment.comment
-                }
+            await RollupService(self.session).record(appointment, bookings=-1, cancellations=1)
+
+        occupancy_index.release(appointment.master_id, appointment.salon_id, appointment.date_time, appointment.end_time)
+
+        return {
+            "status": "success",
+            "message": "Appointment deleted successfully",
+            "data": {
+                "id": appointment.id,
+                "salon_id": appointment.salon_id,
+                "master_id": appointment.master_id,
+                "service_id": appointment.service_id,
+                "date_time": appointment.date_time.isoformat(),
+                "end_time": appointment.end_time.isoformat(),
+                "status": appointment.status,
+                "comment": appointment.comment
             }
+        }
+
+    async def _resolve_slot_request(
+        self,
+        salon_id: int,
+        service_id: int,
+        master_id: int | None = None,
+    ) -> tuple[timedelta, list[int]]:
+        """
+        Проверка салона и услуги, выбор мастеров-кандидатов для поиска слотов
+
+        Args:
+            salon_id: ID салона
+            service_id: ID услуги
+            master_id: ID мастера; если не задан или равен 0 — все мастера салона
+
+        Returns:
+            tuple[timedelta, list[int]]: продолжительность услуги и ID мастеров
+        """
+        salon_stmt = select(DBsalon).where(DBsalon.id == salon_id, DBsalon.is_active == True)
+        salon_result = await self.session.execute(salon_stmt)
+        salon = salon_result.scalar_one_or_none()
+        if not salon:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Salon not found")
+
+        service_stmt = select(DBservice).where(DBservice.id == service_id, DBservice.is_active == True)
+        service_result = await self.session.execute(service_stmt)
+        service = service_result.scalar_one_or_none()
+        if not service:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Service not found")
+
+        if master_id and master_id > 0:
+            master_ids_stmt = select(DBmaster.id).where(DBmaster.id == master_id, DBmaster.is_active == True)
+        else:
+            master_ids_stmt = (
+                select(DBmaster.id)
+                .join(DBmaster_salon, DBmaster.id == DBmaster_salon.master_id)
+                .where(
+                    and_(
+                        DBmaster.is_active == True,
+                        DBmaster_salon.salon_id == salon_id
+                    )
+                )
+            )
+        master_ids_result = await self.session.execute(master_ids_stmt)
+        master_ids = [row[0] for row in master_ids_result.fetchall()]
+        if not master_ids:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Masters not found")
+
+        return timedelta(minutes=service.duration_minutes), master_ids
 
     async def get_free_slots(
         self,
@@ -249,144 +393,86 @@ class AppointmentService:
         
         """
         async with self.session.begin():
-            salon_stmt = select(DBsalon).where(DBsalon.id == salon_id, DBsalon.is_active == True)
-            salon_result = await self.session.execute(salon_stmt)
-            salon = salon_result.scalar_one_or_none()
-            if not salon:
-                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Salon not found")
-
-            service_stmt = select(DBservice).where(DBservice.id == service_id, DBservice.is_active == True)
-            service_result = await self.session.execute(service_stmt)
-            service = service_result.scalar_one_or_none()
-            if not service:
-                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Service not found")
-
-            service_duration = timedelta(minutes=service.duration_minutes)
-
-            
-            if master_id and master_id > 0:
-                master_ids_stmt = select(DBmaster.id).where(DBmaster.id == master_id, DBmaster.is_active == True)
-            else:
-                master_ids_stmt = (
-                    select(DBmaster.id)
-                    .join(DBmaster_salon, DBmaster.id == DBmaster_salon.master_id)
-                    .where(
-                        and_(
-                            DBmaster.is_active == True,
-                            DBmaster_salon.salon_id == salon_id
-                        )
-                    )
-                )
-            master_ids_result = await self.session.execute(master_ids_stmt)
-            master_ids = [row[0] for row in master_ids_result.fetchall()]
-            if not master_ids:
-                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Masters not found")
-
-            schedule_service_instance = schedule_service.ScheduleService(self.session)
-            available_masters = await schedule_service_instance.get_available_masters(
-                salon_id,
-                service_id,
-                target_date
-            )
-            master_ids = [m_id for m_id in master_ids if m_id in available_masters]
-            if not master_ids:
-                return []
-            
-            target_weekday = target_date.weekday()
-            salon_schedule_stmt = select(DBsalon_schedules).where(
-                and_(
-                    DBsalon_schedules.salon_id == salon_id,
-                    DBsalon_schedules.day_of_week == target_weekday,
-                    DBsalon_schedules.is_working == True
-                )
-            )
-            salon_schedule_result = await self.session.execute(salon_schedule_stmt)
-            salon_schedule = salon_schedule_result.scalar_one_or_none()
-            
-            if not salon_schedule:
-                return []
+            service_duration, master_ids = await self._resolve_slot_request(salon_id, service_id, master_id)
 
             now = datetime.now()
             min_start_time = now + timedelta(hours=min_hours_before)
-            day_start = datetime.combine(target_date, time(0, 0))
-            day_end = day_start + timedelta(days=1)
 
-            def is_overlaps(start: datetime, end: datetime, intervals: list[tuple[datetime, datetime]]) -> bool:
-                for s, e in intervals:
-                    if start < e and end > s:
-                        return True
-                return False
+            engine = SlotEngine(self.session)
+            snapshot = await engine.load(salon_id, master_ids, target_date, target_date)
 
             masters_slots: list[dict] = []
-
             for m_id in master_ids:
-                master_schedule_stmt = select(DBmaster_schedules).where(
-                    and_(
-                        DBmaster_schedules.master_id == m_id,
-                        DBmaster_schedules.salon_id == salon_id,
-                        DBmaster_schedules.day_of_week == target_weekday,
-                        DBmaster_schedules.is_working == True
-                    )
-                )
-                master_schedule_result = await self.session.execute(master_schedule_stmt)
-                master_schedule = master_schedule_result.scalar_one_or_none()
-                
-                working_schedule = master_schedule if master_schedule else salon_schedule
-                
-                appointments_stmt = select(DBappointment).where(
-                    and_(
-                        DBappointment.salon_id == salon_id,
-                        DBappointment.master_id == m_id,
-                        DBappointment.is_active == True,
-                        DBappointment.date_time >= day_start,
-                        DBappointment.date_time < day_end,
-                    )
-                )
-                appointments_result = await self.session.execute(appointments_stmt)
-                appointments: list[DBappointment] = appointments_result.scalars().all()
-
-                busy_intervals: list[tuple[datetime, datetime]] = []
-                for apt in appointments:
-                    busy_intervals.append((apt.date_time, apt.end_time))
-
-                free_slots: list[dict] = []
-                work_start = datetime.combine(target_date, working_schedule.start_time)
-                work_end = datetime.combine(target_date, working_schedule.end_time)
-                current_start = work_start
-
-                while current_start + service_duration <= work_end:
-                    current_end = current_start + service_duration
-
-                    if current_start < min_start_time:
-                        current_start += timedelta(minutes=15)
-                        continue
-
-                    if working_schedule.break_start and working_schedule.break_end:
-                        lunch_start = datetime.combine(target_date, working_schedule.break_start)
-                        lunch_end = datetime.combine(target_date, working_schedule.break_end)
-                        
-                        if current_start < lunch_end and current_end > lunch_start:
-                            current_start = lunch_end
-                            continue
-
-                    if not is_overlaps(current_start, current_end, busy_intervals):
-                        free_slots.append(
+                free_slots = snapshot.free_slots(m_id, target_date, service_duration, min_start_time)
+                if not free_slots:
+                    continue
+                masters_slots.append(
+                    {
+                        "master_id": m_id,
+                        "slots": [
                             {
-                                "start": current_start.isoformat(),
-                                "end": current_end.isoformat(),
+                                "start": start.isoformat(),
+                                "end": end.isoformat(),
                             }
-                        )
+                            for start, end in free_slots
+                        ],
+                    }
+                )
 
-                    current_start += timedelta(minutes=15)
+            return masters_slots
 
-                masters_slots.append(
+    async def get_availability_calendar(
+        self,
+        salon_id: int,
+        service_id: int,
+        date_from: date,
+        days: int = 31,
+        master_id: int | None = None,
+        min_hours_before: int = 2,
+    ) -> list[dict]:
+        """
+        Календарь доступных дней за период
+
+        Записи всего периода и недельные расписания загружаются одним пакетом,
+        слоты по дням считаются в памяти.
+
+        Args:
+            salon_id: ID салона
+            service_id: ID услуги
+            date_from: первый день периода
+            days: количество дней в периоде
+            master_id: ID мастера; если не задан или равен 0 — любой мастер салона
+            min_hours_before: показать слоты не раньше чем через N часов
+
+        Returns:
+            list[dict]: по каждому дню — есть ли свободное время и сколько слотов
+        """
+        async with self.session.begin():
+            service_duration, master_ids = await self._resolve_slot_request(salon_id, service_id, master_id)
+
+            min_start_time = datetime.now() + timedelta(hours=min_hours_before)
+            date_to = date_from + timedelta(days=days - 1)
+
+            engine = SlotEngine(self.session)
+            snapshot = await engine.load(salon_id, master_ids, date_from, date_to)
+
+            calendar: list[dict] = []
+            for offset in range(days):
+                day = date_from + timedelta(days=offset)
+                # при выборе «любого мастера» одно время у разных мастеров — один слот
+                starts = set()
+                for m_id in master_ids:
+                    for start, _ in snapshot.free_slots(m_id, day, service_duration, min_start_time):
+                        starts.add(start)
+                calendar.append(
                     {
-                        "master_id": m_id,
-                        "slots": free_slots,
+                        "date": day.isoformat(),
+                        "available": bool(starts),
+                        "slots_count": len(starts),
                     }
                 )
 
-            return masters_slots
+            return calendar
 
     async def update_appointment(
         self,
@@ -409,7 +495,7 @@ class AppointmentService:
             dict: Информация об обновленной записи
         """
         async with self.session.begin():
-            stmt = select(DBappointment).where(DBappointment.id == appointment_id)
+            stmt = select(DBappointment).where(DBappointment.id == appointment_id).with_for_update()
             result = await self.session.execute(stmt)
             appointment = result.scalar_one_or_none()
             
@@ -430,20 +516,33 @@ class AppointmentService:
                     status_code=status.HTTP_410_GONE,
                     detail="This appointment has already been deleted"
                 )
+            old_interval = (appointment.master_id, appointment.salon_id, appointment.date_time, appointment.end_time)
+            rollups = RollupService(self.session)
+            # итоги переносятся со старого дня и мастера на новые
+            await rollups.record(appointment, bookings=-1)
+            # продолжительность записи сохраняется при переносе
+            appointment.end_time = date_time + (appointment.end_time - appointment.date_time)
             appointment.date_time = date_time
+            if master_id != appointment.master_id:
+                # у другого мастера своя цена услуги
+                appointment.price = await self.session.scalar(select(appointment_price(master_id, appointment.service_id)))
             appointment.master_id = master_id
             appointment.comment = comment
-            await self.session.flush()
+            await self._flush_booking(appointment, "update")
+            await rollups.record(appointment, bookings=1)
             await self.session.refresh(appointment)
-            return {
-                    "status": "success",
-                    "data": {
-                        "id": appointment.id,
-                        "date_time": appointment.date_time,
-                        "end_time": appointment.end_time,
-                        "master_id": appointment.master_id,
-                        "comment": appointment.comment,
-                        "updated_at": appointment.updated_at.isoformat()
-                    },
-                    "message": "Appointment updated successfully"
-                    }
+
+        occupancy_index.release(*old_interval)
+        occupancy_index.occupy(appointment.master_id, appointment.salon_id, appointment.date_time, appointment.end_time)
+
+        return {
+                "status": "success",
+                "data": {
+                    "id": appointment.id,
+                    "date_time": appointment.date_time,
+                    "end_time": appointment.end_time,
+                    "master_id": appointment.master_id,
+                    "comment": appointment.comment
+                },
+                "message": "Appointment updated successfully"
+                }
@@ -0,0 +1,138 @@
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta
+from enum import Enum
+from typing import AsyncIterator
+
+from sqlalchemy import Select, select
+
+from src.core.database import AsyncReadSessionLocal
+from src.core.utils import get_setting
+from src.models import (
+    appointments as DBappointment,
+    reviews as DBReview
+)
+
+
+# Строк на одну выборку с сервера и на один отправляемый клиенту фрагмент
+EXPORT_BATCH_SIZE = get_setting("EXPORT_BATCH_SIZE", 1000)
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+APPOINTMENT_COLUMNS = (
+    DBappointment.id,
+    DBappointment.salon_id,
+    DBappointment.master_id,
+    DBappointment.service_id,
+    DBappointment.client_id,
+    DBappointment.date_time,
+    DBappointment.end_time,
+    DBappointment.status,
+    DBappointment.price,
+    DBappointment.comment,
+    DBappointment.is_active,
+    DBappointment.created_at,
+)
+
+REVIEW_COLUMNS = (
+    DBReview.id,
+    DBReview.user_id,
+    DBReview.master_id,
+    DBReview.salon_id,
+    DBReview.appointment_id,
+    DBReview.rating,
+    DBReview.text,
+    DBReview.is_moderated,
+    DBReview.is_active,
+    DBReview.reason_for_deletion,
+    DBReview.created_at,
+)
+
+
+def _period(column, date_from: date | None, date_to: date | None) -> list:
+    """Условия на столбец-момент: дни date_from..date_to включительно"""
+    conditions = []
+    if date_from:
+        conditions.append(column >= datetime.combine(date_from, time(0, 0)))
+    if date_to:
+        conditions.append(column < datetime.combine(date_to + timedelta(days=1), time(0, 0)))
+    return conditions
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+class ExportService:
+    """
+    Выгрузка записей и отзывов салона потоком строк
+
+    Строки читаются с сервера порциями по EXPORT_BATCH_SIZE (серверный курсор
+    через AsyncSession.stream) и сразу отдаются клиенту, поэтому память не
+    зависит от размера выгрузки. Следующая порция читается только после того,
+    как клиент принял предыдущую. Выгрузка открывает свою сессию (реплика, если
+    настроена): сессия запроса закрывается раньше, чем заканчивается передача.
+    """
+
+    def __init__(self, session_factory=AsyncReadSessionLocal, batch_size: int = EXPORT_BATCH_SIZE):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+
+    @staticmethod
+    def appointments_query(salon_id: int, date_from: date | None = None, date_to: date | None = None) -> Select:
+        """Записи салона за период (по времени записи)"""
+        return (
+            select(*APPOINTMENT_COLUMNS)
+            .where(DBappointment.salon_id == salon_id, *_period(DBappointment.date_time, date_from, date_to))
+            .order_by(DBappointment.date_time, DBappointment.id)
+        )
+
+    @staticmethod
+    def reviews_query(salon_id: int, date_from: date | None = None, date_to: date | None = None) -> Select:
+        """Отзывы о салоне и его мастерах по записям салона за период (по дате отзыва)"""
+        return (
+            select(*REVIEW_COLUMNS)
+            .join(DBappointment, DBReview.appointment_id == DBappointment.id)
+            .where(DBappointment.salon_id == salon_id, *_period(DBReview.created_at, date_from, date_to))
+            .order_by(DBReview.id)
+        )
+
+    async def _partitions(self, query: Select) -> AsyncIterator[list]:
+        async with self.session_factory() as session:
+            result = await session.stream(query.execution_options(yield_per=self.batch_size))
+            async for rows in result.partitions():
+                yield rows
+
+    async def stream(self, query: Select, export_format: str) -> AsyncIterator[str]:
+        """
+        Фрагменты выгрузки в формате ndjson (объект на строку) или csv (с заголовком)
+
+        Args:
+            query: appointments_query или reviews_query
+            export_format: ключ EXPORT_FORMATS
+        """
+        columns = [column.key for column in query.selected_columns]
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            yield buffer.getvalue()
+            async for rows in self._partitions(query):
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows([_plain(value) for value in row] for row in rows)
+                yield buffer.getvalue()
+        else:
+            async for rows in self._partitions(query):
+                yield "".join(
+                    json.dumps(dict(zip(columns, map(_plain, row))), ensure_ascii=False) + "\n"
+                    for row in rows
+                )
@@ -2,6 +2,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
+from src.core.cache import catalog_cache
 from src.models import masters as DBmaster
 from src.repository.base_repo import BaseRepository
 from src.schemas import MasterEdit
@@ -30,17 +31,18 @@ class MasterService:
             master.photo = master_data.photo
             master.specialization = master_data.specialization
             master.about = master_data.about
-            
-            return {
-                "message": "Master updated successfully",
-                "master": {
-                    "id": master.id,
-                    "user_id": master.user_id,
-                    "photo": master.photo,
-                    "specialization": master.specialization,
-                    "about": master.about
-                }
+
+        catalog_cache.invalidate()
+        return {
+            "message": "Master updated successfully",
+            "master": {
+                "id": master.id,
+                "user_id": master.user_id,
+                "photo": master.photo,
+                "specialization": master.specialization,
+                "about": master.about
             }
+        }
 
 
     async def update_master_status(self, master_id: int, status: bool, admin_id: int, reason: str=None) -> dict:
@@ -64,7 +66,7 @@ class MasterService:
                     master.reason_for_deletion = None
                 
                 status_str = "activated" if status else "deactivated"
-                return {
+                response = {
                     "status": "success",
                     "message": f"Master has been successfully {status_str}.",
                     "data": {
@@ -78,3 +80,6 @@ class MasterService:
                         "changed_by_admin_id": admin_id
                     },
                     }
+
+            catalog_cache.invalidate()
+            return response
@@ -0,0 +1,197 @@
+from collections import Counter
+from datetime import date, timedelta
+
+from sqlalchemy import func, select, literal_column
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import (
+    services as DBservice,
+    master_salon as DBmaster_salon,
+    booking_daily_rollups as DBrollup
+)
+from src.services.slot_engine import SlotEngine, working_segments
+
+
+REPORT_PERIODS = ("day", "week", "month")
+
+
+def weekday_counts(date_from: date, date_to: date) -> Counter:
+    """Сколько раз каждый день недели (0=понедельник) встречается в периоде"""
+    days = (date_to - date_from).days + 1
+    counts = Counter({weekday: days // 7 for weekday in range(7)})
+    for offset in range(days % 7):
+        counts[(date_from.weekday() + offset) % 7] += 1
+    return counts
+
+
+def scheduled_minutes(schedule) -> int:
+    """Рабочие минуты дня по строке расписания без перерыва"""
+    return sum(
+        (end - start) // timedelta(minutes=1)
+        for start, end in working_segments(date.min, schedule)
+    )
+
+
+class ReportService:
+    """
+    Отчёты по записям салонов (ТЗ 2.2.3)
+
+    Отчёты читают дневные итоги booking_daily_rollups (см. RollupService),
+    а не таблицу appointments: объём чтения зависит от числа дней в периоде,
+    а не от числа записей. В память попадают только итоговые строки.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @property
+    def _dialect(self) -> str:
+        return self.session.get_bind().dialect.name
+
+    def _period_start(self, column, period: str):
+        """Начало дня/недели (понедельник)/месяца, в который попадает день column"""
+        if self._dialect == "postgresql":
+            return func.date(func.date_trunc(period, column))
+        if period == "week":
+            return func.date(column, "-6 days", "weekday 1")
+        if period == "month":
+            return func.date(column, "start of month")
+        return func.date(column)
+
+    @staticmethod
+    def _range(salon_ids: list[int] | None, date_from: date, date_to: date) -> list:
+        conditions = [DBrollup.day >= date_from, DBrollup.day <= date_to]
+        if salon_ids is not None:
+            conditions.append(DBrollup.salon_id.in_(salon_ids))
+        return conditions
+
+    async def bookings_per_period(
+        self,
+        salon_ids: list[int] | None,
+        date_from: date,
+        date_to: date,
+        period: str = "day"
+    ) -> list[dict]:
+        """
+        Количество записей по дням, неделям или месяцам
+
+        Args:
+            salon_ids: салоны (None — все)
+            date_from: первый день периода
+            date_to: последний день периода (включительно)
+            period: day, week или month
+
+        Returns:
+            list[dict]: начало периода, активные записи и отменённые
+        """
+        period_start = self._period_start(DBrollup.day, period).label("period_start")
+        stmt = (
+            select(
+                period_start,
+                func.sum(DBrollup.bookings).label("bookings"),
+                func.sum(DBrollup.cancellations).label("cancelled"),
+            )
+            .where(*self._range(salon_ids, date_from, date_to))
+            .group_by(literal_column("period_start"))
+            .order_by(literal_column("period_start"))
+        )
+        result = await self.session.execute(stmt)
+        return [
+            {"period_start": str(row.period_start), "bookings": int(row.bookings), "cancelled": int(row.cancelled)}
+            for row in result.all()
+        ]
+
+    async def master_utilization(self, salon_ids: list[int] | None, date_from: date, date_to: date) -> list[dict]:
+        """
+        Загрузка мастеров: записи и занятые минуты против рабочих минут по расписанию
+
+        Рабочие минуты считаются как в поиске слотов: расписание мастера в салоне,
+        а если его нет — расписание салона, только в дни работы салона.
+
+        Returns:
+            list[dict]: по каждой паре салон–мастер записи, booked_minutes,
+                scheduled_minutes и utilization (доля от 0 до 1)
+        """
+        booked_stmt = (
+            select(
+                DBrollup.salon_id,
+                DBrollup.master_id,
+                func.sum(DBrollup.bookings).label("bookings"),
+                func.sum(DBrollup.booked_minutes).label("booked_minutes"),
+            )
+            .where(*self._range(salon_ids, date_from, date_to))
+            .group_by(DBrollup.salon_id, DBrollup.master_id)
+            .having(func.sum(DBrollup.bookings) > 0)
+        )
+        booked_result = await self.session.execute(booked_stmt)
+        booked = {(row.salon_id, row.master_id): row for row in booked_result.all()}
+
+        members_stmt = select(DBmaster_salon.salon_id, DBmaster_salon.master_id)
+        if salon_ids is not None:
+            members_stmt = members_stmt.where(DBmaster_salon.salon_id.in_(salon_ids))
+        members_result = await self.session.execute(members_stmt)
+        pairs = set(members_result.all()) | set(booked)
+
+        weekdays = weekday_counts(date_from, date_to)
+        engine = SlotEngine(self.session)
+        schedules = {}
+        report = []
+        for salon_id, master_id in sorted(pairs):
+            if salon_id not in schedules:
+                schedules[salon_id] = await engine.load_schedules(salon_id)
+            salon_schedules, master_schedules = schedules[salon_id]
+            scheduled = sum(
+                scheduled_minutes(master_schedules.get((master_id, weekday), salon_schedule)) * weekdays[weekday]
+                for weekday, salon_schedule in salon_schedules.items()
+            )
+            row = booked.get((salon_id, master_id))
+            booked_minutes = int(row.booked_minutes) if row else 0
+            report.append({
+                "salon_id": salon_id,
+                "master_id": master_id,
+                "bookings": int(row.bookings) if row else 0,
+                "booked_minutes": booked_minutes,
+                "scheduled_minutes": scheduled,
+                "utilization": round(booked_minutes / scheduled, 3) if scheduled else None,
+            })
+        return report
+
+    async def top_services(
+        self,
+        salon_ids: list[int] | None,
+        date_from: date,
+        date_to: date,
+        limit: int = 10
+    ) -> list[dict]:
+        """
+        Самые популярные услуги по числу активных записей
+
+        Returns:
+            list[dict]: услуга, количество записей и выручка по ценам мастеров
+        """
+        bookings = func.sum(DBrollup.bookings).label("bookings")
+        stmt = (
+            select(
+                DBservice.id.label("service_id"),
+                DBservice.description,
+                bookings,
+                func.sum(DBrollup.revenue).label("revenue"),
+            )
+            .select_from(DBrollup)
+            .join(DBservice, DBrollup.service_id == DBservice.id)
+            .where(*self._range(salon_ids, date_from, date_to))
+            .group_by(DBservice.id, DBservice.description)
+            .having(bookings > 0)
+            .order_by(bookings.desc(), DBservice.id)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [
+            {
+                "service_id": row.service_id,
+                "description": row.description,
+                "bookings": int(row.bookings),
+                "revenue": int(row.revenue or 0),
+            }
+            for row in result.all()
+        ]
@@ -1,4 +1,5 @@
-from sqlalchemy import select
+from sqlalchemy import select, func, case, delete, literal
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
@@ -6,10 +7,24 @@ from src.models import reviews as DBReview
 from src.models import appointments as DBAppointment
 from src.models import masters as DBMaster
 from src.models import salons as DBSalon
+from src.models import rating_summaries as DBRatingSummary
+from src.core.cache import catalog_cache, rating_cache
+from src.core.pagination import keyset_page
 from src.repository.base_repo import BaseRepository
 from src.schemas.review import ReviewCreate, ReviewUpdate, RatingStatsResponse
 
 
+STAR_FIELDS = ("one_star", "two_star", "three_star", "four_star", "five_star")
+# Поля, по которым можно сортировать списки отзывов (второй столбец ключа — id)
+REVIEW_SORT_COLUMNS = {"created_at": DBReview.created_at, "rating": DBReview.rating}
+
+
+def invalidate_ratings() -> None:
+    """Сбросить кэши с рейтингами: статистику и каталог (вызывать после commit)"""
+    rating_cache.invalidate()
+    catalog_cache.invalidate()
+
+
 class ReviewService:
     """Сервис для управления отзывами"""
     
@@ -105,7 +120,9 @@ class ReviewService:
             )
             self.session.add(new_review)
             await self.session.flush()
+            await self._apply_rating_delta(new_review, new_review.rating, 1)
             
+        invalidate_ratings()
         return new_review
     
     async def get_reviews(
@@ -113,11 +130,17 @@ class ReviewService:
         master_id: int | None = None,
         salon_id: int | None = None,
         limit: int = 20,
-        offset: int = 0,
+        cursor: str | None = None,
         sort_by: str = "created_at",
-        order: str = "desc"
-    ) -> list[DBReview]:
-        """Получение списка отзывов с фильтрацией"""
+        order: str = "desc",
+        is_moderated: bool | None = None
+    ) -> tuple[list[DBReview], str | None]:
+        """
+        Получение страницы активных отзывов с фильтрацией
+
+        Returns:
+            tuple: отзывы страницы и курсор следующей страницы
+        """
         
         query = select(DBReview).where(DBReview.is_active == True)
         
@@ -126,22 +149,33 @@ class ReviewService:
         
         if salon_id:
             query = query.where(DBReview.salon_id == salon_id)
+
+        if is_moderated is not None:
+            query = query.where(DBReview.is_moderated == is_moderated)
         
-        if sort_by == "rating":
-            if order.lower() == "desc":
-                query = query.order_by(DBReview.rating.desc())
-            else:
-                query = query.order_by(DBReview.rating.asc())
-        else:  # по умолчанию created_at
-            if order.lower() == "desc":
-                query = query.order_by(DBReview.created_at.desc())
-            else:
-                query = query.order_by(DBReview.created_at.asc())
-        
-        query = query.limit(limit).offset(offset)
-        
-        result = await self.session.execute(query)
-        return result.scalars().all()
+        return await self._page(query, limit, cursor, sort_by, order)
+
+    async def _page(
+        self,
+        query,
+        limit: int,
+        cursor: str | None,
+        sort_by: str,
+        order: str
+    ) -> tuple[list[DBReview], str | None]:
+        """Страница отзывов по ключу (поле сортировки, id); неизвестное поле — created_at"""
+        if sort_by not in REVIEW_SORT_COLUMNS:
+            sort_by = "created_at"
+        descending = order.lower() == "desc"
+        return await keyset_page(
+            self.session,
+            query,
+            [REVIEW_SORT_COLUMNS[sort_by], DBReview.id],
+            descending,
+            limit,
+            cursor,
+            scope=f"{sort_by}:{'desc' if descending else 'asc'}"
+        )
     
     async def get_rating_stats(
         self,
@@ -159,45 +193,211 @@ class ReviewService:
             RatingStatsResponse: Статистика рейтинга
         """
         
-        query = select(DBReview).where(DBReview.is_active == True)
+        return await rating_cache.get_or_load(
+            ("stats", master_id, salon_id),
+            lambda: self._load_rating_stats(master_id, salon_id),
+            self.session.info.get("replica_max_lag", 0.0)
+        )
+
+    async def _load_rating_stats(self, master_id: int | None, salon_id: int | None) -> RatingStatsResponse:
+        if bool(master_id) != bool(salon_id):
+            entity_type, entity_id = ("master", master_id) if master_id else ("salon", salon_id)
+            summary = await self.session.get(DBRatingSummary, (entity_type, entity_id))
+            return self._summary_to_stats(summary)
         
+        conditions = []
         if master_id:
-            query = query.where(DBReview.master_id == master_id)
-        
+            conditions.append(DBReview.master_id == master_id)
         if salon_id:
-            query = query.where(DBReview.salon_id == salon_id)
+            conditions.append(DBReview.salon_id == salon_id)
         
-        result = await self.session.execute(query)
-        reviews = result.scalars().all()
+        stats = await self._aggregate_ratings(*conditions)
         
-        if not reviews:
+        return RatingStatsResponse(
+            average_rating=stats["average_rating"],
+            total_reviews=stats["total_reviews"],
+            **stats["ratings_distribution"]
+        )
+    
+    @staticmethod
+    def _summary_to_stats(summary: DBRatingSummary | None) -> RatingStatsResponse:
+        """Преобразование строки rating_summaries в RatingStatsResponse"""
+        if not summary or not summary.reviews_count:
             return RatingStatsResponse(
                 average_rating=0.0,
                 total_reviews=0,
-                one_star=0,
-                two_star=0,
-                three_star=0,
-                four_star=0,
-                five_star=0
+                **{field: 0 for field in STAR_FIELDS}
             )
         
-        ratings = [r.rating for r in reviews]
-        average = sum(ratings) / len(ratings)
+        return RatingStatsResponse(
+            average_rating=round(summary.rating_sum / summary.reviews_count, 1),
+            total_reviews=summary.reviews_count,
+            **{field: getattr(summary, field) for field in STAR_FIELDS}
+        )
+    
+    async def _apply_rating_delta(self, review: DBReview, rating: int, sign: int) -> None:
+        """
+        Изменение сводок рейтинга мастера и салона отзыва в текущей транзакции
         
-        star_counts = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-        for r in reviews:
-            star_counts[r.rating] += 1
+        Args:
+            review: отзыв (учитываются его master_id и salon_id)
+            rating: оценка, которую нужно добавить или убрать
+            sign: 1 — учесть оценку, -1 — убрать её
+        """
+        dialect = self.session.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        
+        for entity_type, entity_id in (("master", review.master_id), ("salon", review.salon_id)):
+            if not entity_id:
+                continue
+            values = {field: 0 for field in STAR_FIELDS}
+            values[STAR_FIELDS[rating - 1]] = sign
+            stmt = insert(DBRatingSummary).values(
+                entity_type=entity_type,
+                entity_id=entity_id,
+                rating_sum=sign * rating,
+                reviews_count=sign,
+                **values
+            )
+            counters = ("rating_sum", "reviews_count", *STAR_FIELDS)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[DBRatingSummary.entity_type, DBRatingSummary.entity_id],
+                set_={
+                    column: getattr(DBRatingSummary, column) + getattr(stmt.excluded, column)
+                    for column in counters
+                }
+            )
+            await self.session.execute(stmt)
+    
+    async def rebuild_rating_summaries(self) -> int:
+        """
+        Полный пересчёт rating_summaries из таблицы reviews
         
-        return RatingStatsResponse(
-            average_rating=round(average, 1),
-            total_reviews=len(reviews),
-            one_star=star_counts[1],
-            two_star=star_counts[2],
-            three_star=star_counts[3],
-            four_star=star_counts[4],
-            five_star=star_counts[5]
+        Используется для первичного заполнения и восстановления после ручных
+        правок отзывов в БД.
+        
+        Returns:
+            int: количество записанных сводок
+        """
+        def count_where(condition):
+            return func.sum(case((condition, 1), else_=0))
+        
+        columns = ["entity_type", "entity_id", "rating_sum", "reviews_count", *STAR_FIELDS]
+        written = 0
+        async with self.session.begin():
+            await self.session.execute(delete(DBRatingSummary))
+            for entity_type, group_column in (("master", DBReview.master_id), ("salon", DBReview.salon_id)):
+                aggregate = (
+                    select(
+                        literal(entity_type),
+                        group_column,
+                        func.sum(DBReview.rating),
+                        func.count(DBReview.id),
+                        *[count_where(DBReview.rating == stars) for stars in range(1, 6)]
+                    )
+                    .where(DBReview.is_active == True, group_column.is_not(None))
+                    .group_by(group_column)
+                )
+                result = await self.session.execute(
+                    DBRatingSummary.__table__.insert().from_select(columns, aggregate)
+                )
+                written += result.rowcount
+        invalidate_ratings()
+        return written
+    
+    async def _aggregate_ratings(self, *conditions) -> dict:
+        """
+        Статистика активных отзывов, посчитанная в БД одним запросом
+        
+        Среднее, количество, число промодерированных и распределение по звёздам
+        считаются условными агрегатами, в Python возвращается одна строка.
+        
+        Args:
+            conditions: дополнительные условия отбора отзывов
+            
+        Returns:
+            dict: total_reviews, average_rating, moderated_reviews,
+            unmoderated_reviews, ratings_distribution
+        """
+        def count_where(condition):
+            return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+        
+        query = select(
+            func.count(DBReview.id),
+            func.avg(DBReview.rating),
+            count_where(DBReview.is_moderated == True),
+            *[count_where(DBReview.rating == stars) for stars in range(1, 6)]
+        ).where(DBReview.is_active == True, *conditions)
+        
+        result = await self.session.execute(query)
+        total, average, moderated, *star_counts = result.one()
+        
+        return {
+            "total_reviews": total,
+            "average_rating": round(float(average), 1) if total else 0.0,
+            "moderated_reviews": moderated,
+            "unmoderated_reviews": total - moderated,
+            "ratings_distribution": dict(zip(STAR_FIELDS, star_counts))
+        }
+    
+    async def get_average_ratings(
+        self,
+        master_ids: list[int] | None = None,
+        salon_ids: list[int] | None = None
+    ) -> dict[int, tuple[float, int]]:
+        """
+        Средний рейтинг и количество отзывов сразу для списка мастеров или салонов
+        
+        Значения читаются из rating_summaries по первичному ключу, без обхода отзывов.
+        
+        Args:
+            master_ids: ID мастеров (группировка по мастеру)
+            salon_ids: ID салонов (группировка по салону, если master_ids не заданы)
+            
+        Returns:
+            dict[int, tuple[float, int]]: ID -> (средний рейтинг, количество отзывов);
+            сущностей без отзывов в словаре нет
+        """
+        if master_ids is not None:
+            entity_type, ids = "master", master_ids
+        else:
+            entity_type, ids = "salon", salon_ids or []
+        
+        if not ids:
+            return {}
+        
+        query = select(
+            DBRatingSummary.entity_id,
+            DBRatingSummary.rating_sum,
+            DBRatingSummary.reviews_count
+        ).where(
+            DBRatingSummary.entity_type == entity_type,
+            DBRatingSummary.entity_id.in_(ids),
+            DBRatingSummary.reviews_count > 0
         )
+        result = await self.session.execute(query)
+        return {
+            entity_id: (round(rating_sum / total, 1), total)
+            for entity_id, rating_sum, total in result.all()
+        }
     
+    async def _get_for_update(self, review_id: int) -> DBReview | None:
+        """
+        Отзыв с блокировкой строки до конца транзакции
+
+        Проверка is_active и изменение сводок рейтинга выполняются под блокировкой,
+        поэтому параллельные удаление/отклонение/правка одного отзыва не учитывают
+        его в rating_summaries дважды.
+        """
+        stmt = (
+            select(DBReview)
+            .where(DBReview.id == review_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
     async def delete_review(self, user_id: int, review_id: int, reason: str | None = None) -> DBReview:
         """
         Удаление отзыва (мягкое удаление).
@@ -215,7 +415,7 @@ class ReviewService:
             HTTPException: Если отзыв не найден или нет прав
         """
         
-        review = await self.repo.get_by_id(review_id)
+        review = await self._get_for_update(review_id)
         if not review:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -230,9 +430,12 @@ class ReviewService:
             )
         
        
+        if review.is_active:
+            await self._apply_rating_delta(review, review.rating, -1)
         review.is_active = False
         review.reason_for_deletion = reason or "Удалено пользователем"
         await self.session.commit()
+        invalidate_ratings()
         
         return review
     
@@ -258,7 +461,7 @@ class ReviewService:
             HTTPException: Если отзыв не найден или нет прав
         """
         
-        review = await self.repo.get_by_id(review_id)
+        review = await self._get_for_update(review_id)
         if not review:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -271,13 +474,20 @@ class ReviewService:
                 detail="У вас нет прав редактировать этот отзыв"
             )
         
+        rating_changed = False
         if update_data.rating is not None:
+            if review.is_active and update_data.rating != review.rating:
+                await self._apply_rating_delta(review, review.rating, -1)
+                await self._apply_rating_delta(review, update_data.rating, 1)
+                rating_changed = True
             review.rating = update_data.rating
         
         if update_data.text is not None:
             review.text = update_data.text
         
         await self.session.commit()
+        if rating_changed:
+            invalidate_ratings()
         return review
     
     async def get_all_reviews_admin(
@@ -286,11 +496,11 @@ class ReviewService:
         salon_id: int | None = None,
         is_moderated: bool | None = None,
         limit: int = 50,
-        offset: int = 0,
+        cursor: str | None = None,
         sort_by: str = "created_at",
         order: str = "desc"
-    ):
-        """Получение всех отзывов для администратора"""
+    ) -> tuple[list[DBReview], str | None]:
+        """Получение страницы всех отзывов (включая удалённые) для администратора"""
         
         query = select(DBReview)
         
@@ -303,17 +513,7 @@ class ReviewService:
         if is_moderated is not None:
             query = query.where(DBReview.is_moderated == is_moderated)
         
-        sort_column = getattr(DBReview, sort_by, DBReview.created_at)
-        if order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-        
-        
-        query = query.limit(limit).offset(offset)
-        
-        result = await self.session.execute(query)
-        return result.scalars().all()
+        return await self._page(query, limit, cursor, sort_by, order)
     
     async def approve_review(self, review_id: int) -> DBReview:
         """Одобрение отзыва"""
@@ -332,127 +532,46 @@ class ReviewService:
     async def reject_review(self, review_id: int, reason: str) -> DBReview:
         """Отклонение отзыва (мягкое удаление)"""
         
-        review = await self.repo.get_by_id(review_id)
+        review = await self._get_for_update(review_id)
         if not review:
             raise HTTPException(
                 status_code=404,
                 detail="Отзыв не найден"
             )
         
+        if review.is_active:
+            await self._apply_rating_delta(review, review.rating, -1)
         review.is_active = False
         review.reason_for_deletion = reason
         await self.session.commit()
+        invalidate_ratings()
         return review
     
     async def delete_review_admin(self, review_id: int, admin_id: int, reason: str) -> DBReview:
         """Удаление отзыва администратором"""
         
-        review = await self.repo.get_by_id(review_id)
+        review = await self._get_for_update(review_id)
         if not review:
             raise HTTPException(
                 status_code=404,
                 detail="Отзыв не найден"
             )
         
+        if review.is_active:
+            await self._apply_rating_delta(review, review.rating, -1)
         review.is_active = False
         review.reason_for_deletion = f"Удалено админом {admin_id}: {reason}"
         await self.session.commit()
+        invalidate_ratings()
         return review
     
     async def get_reviews_statistics(self):
         """Получение общей статистики по отзывам"""
         
-        query = select(DBReview).where(DBReview.is_active == True)
-        result = await self.session.execute(query)
-        reviews = result.scalars().all()
-        
-        total_reviews = len(reviews)
-        if total_reviews == 0:
-            return {
-                "total_reviews": 0,
-                "average_rating": 0.0,
-                "moderated_reviews": 0,
-                "unmoderated_reviews": 0,
-                "ratings_distribution": {
-                    "one_star": 0,
-                    "two_star": 0,
-                    "three_star": 0,
-                    "four_star": 0,
-                    "five_star": 0
-                }
-            }
-        
-        ratings = [r.rating for r in reviews]
-        average_rating = sum(ratings) / len(ratings)
-        
-        moderated_count = len([r for r in reviews if r.is_moderated])
-        unmoderated_count = total_reviews - moderated_count
-        
-        star_counts = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-        for r in reviews:
-            star_counts[r.rating] += 1
-        
-        return {
-            "total_reviews": total_reviews,
-            "average_rating": round(average_rating, 1),
-            "moderated_reviews": moderated_count,
-            "unmoderated_reviews": unmoderated_count,
-            "ratings_distribution": {
-                "one_star": star_counts[1],
-                "two_star": star_counts[2],
-                "three_star": star_counts[3],
-                "four_star": star_counts[4],
-                "five_star": star_counts[5]
-            }
-        }
+        return await self._aggregate_ratings()
     
     async def get_salon_reviews_statistics(self, salon_id: int):
         """Получение статистики отзывов конкретного салона"""
         
-        query = select(DBReview).where(
-            (DBReview.salon_id == salon_id) & (DBReview.is_active == True)
-        )
-        result = await self.session.execute(query)
-        reviews = result.scalars().all()
-        
-        total_reviews = len(reviews)
-        if total_reviews == 0:
-            return {
-                "salon_id": salon_id,
-                "total_reviews": 0,
-                "average_rating": 0.0,
-                "moderated_reviews": 0,
-                "unmoderated_reviews": 0,
-                "ratings_distribution": {
-                    "one_star": 0,
-                    "two_star": 0,
-                    "three_star": 0,
-                    "four_star": 0,
-                    "five_star": 0
-                }
-            }
-        
-        ratings = [r.rating for r in reviews]
-        average_rating = sum(ratings) / len(ratings)
-        
-        moderated_count = len([r for r in reviews if r.is_moderated])
-        unmoderated_count = total_reviews - moderated_count
-        
-        star_counts = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-        for r in reviews:
-            star_counts[r.rating] += 1
-        
-        return {
-            "salon_id": salon_id,
-            "total_reviews": total_reviews,
-            "average_rating": round(average_rating, 1),
-            "moderated_reviews": moderated_count,
-            "unmoderated_reviews": unmoderated_count,
-            "ratings_distribution": {
-                "one_star": star_counts[1],
-                "two_star": star_counts[2],
-                "three_star": star_counts[3],
-                "four_star": star_counts[4],
-                "five_star": star_counts[5]
-            }
-        }
+        stats = await self._aggregate_ratings(DBReview.salon_id == salon_id)
+        return {"salon_id": salon_id, **stats}
@@ -0,0 +1,151 @@
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import Integer, and_, case, cast, delete, func, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import (
+    appointments as DBappointment,
+    services as DBservice,
+    master_service as DBmaster_service,
+    booking_daily_rollups as DBrollup
+)
+
+
+ROLLUP_COUNTERS = ("bookings", "booked_minutes", "revenue", "cancellations")
+
+
+def appointment_price(master_id, service_id):
+    """Цена услуги у мастера: персональная, иначе базовая (скалярный подзапрос)"""
+    return (
+        select(func.coalesce(DBmaster_service.personal_price, DBservice.base_price))
+        .select_from(DBservice)
+        .outerjoin(
+            DBmaster_service,
+            and_(DBmaster_service.service_id == DBservice.id, DBmaster_service.master_id == master_id)
+        )
+        .where(DBservice.id == service_id)
+        .scalar_subquery()
+    )
+
+
+class RollupService:
+    """
+    Дневные итоги записей booking_daily_rollups (салон, мастер, услуга, день)
+
+    Пути записи и отмены меняют итоги в своей транзакции через record, поэтому
+    отчёты читают готовые строки вместо таблицы appointments. Выручка считается
+    по цене, сохранённой в записи при бронировании (appointments.price), поэтому
+    отмена снимает ровно то, что добавила запись, даже после смены цен; для записей
+    без сохранённой цены берётся текущая цена мастера. rebuild пересчитывает дни
+    из appointments целиком (первичное заполнение и плановая сверка).
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @property
+    def _dialect(self) -> str:
+        return self.session.get_bind().dialect.name
+
+    def _minutes(self, start, end):
+        """Продолжительность интервала в минутах"""
+        if self._dialect == "postgresql":
+            return func.extract("epoch", end - start) / 60
+        return (func.julianday(end) - func.julianday(start)) * 1440
+
+    async def record(self, appointment: DBappointment, bookings: int = 0, cancellations: int = 0) -> None:
+        """
+        Изменение итогов дня записи в текущей транзакции
+
+        Args:
+            appointment: запись (учитываются салон, мастер, услуга и интервал)
+            bookings: 1 — запись учтена, -1 — снята (отмена или перенос)
+            cancellations: 1 — запись отменена
+        """
+        insert = postgresql.insert if self._dialect == "postgresql" else sqlite.insert
+        minutes = (appointment.end_time - appointment.date_time) // timedelta(minutes=1)
+        price = appointment.price
+        if price is None:
+            price = func.coalesce(appointment_price(appointment.master_id, appointment.service_id), 0)
+
+        stmt = insert(DBrollup).values(
+            salon_id=appointment.salon_id,
+            master_id=appointment.master_id,
+            service_id=appointment.service_id,
+            day=appointment.date_time.date(),
+            bookings=bookings,
+            booked_minutes=bookings * minutes,
+            revenue=bookings * price,
+            cancellations=cancellations
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DBrollup.salon_id, DBrollup.master_id, DBrollup.service_id, DBrollup.day],
+            set_={
+                column: getattr(DBrollup, column) + getattr(stmt.excluded, column)
+                for column in ROLLUP_COUNTERS
+            }
+        )
+        await self.session.execute(stmt)
+
+    async def rebuild(self, date_from: date | None = None, date_to: date | None = None) -> int:
+        """
+        Пересчёт итогов за дни date_from..date_to (по умолчанию за всё время)
+
+        Используется для первичного заполнения, плановой сверки последних дней
+        и восстановления после ручных правок записей в БД.
+
+        Returns:
+            int: количество записанных строк
+        """
+        def count_where(condition):
+            return func.sum(case((condition, 1), else_=0))
+
+        def sum_where(condition, value):
+            return func.coalesce(func.sum(case((condition, value))), 0)
+
+        active = DBappointment.is_active == True
+        day = func.date(DBappointment.date_time)
+        price = func.coalesce(DBappointment.price, DBmaster_service.personal_price, DBservice.base_price)
+        minutes = self._minutes(DBappointment.date_time, DBappointment.end_time)
+
+        appointment_range, rollup_range = [], []
+        if date_from:
+            appointment_range.append(DBappointment.date_time >= datetime.combine(date_from, time(0, 0)))
+            rollup_range.append(DBrollup.day >= date_from)
+        if date_to:
+            appointment_range.append(DBappointment.date_time < datetime.combine(date_to + timedelta(days=1), time(0, 0)))
+            rollup_range.append(DBrollup.day <= date_to)
+
+        aggregate = (
+            select(
+                DBappointment.salon_id,
+                DBappointment.master_id,
+                DBappointment.service_id,
+                day,
+                count_where(active),
+                cast(func.round(sum_where(active, minutes)), Integer),
+                sum_where(active, price),
+                count_where(DBappointment.is_active == False),
+            )
+            .join(DBservice, DBappointment.service_id == DBservice.id)
+            .outerjoin(
+                DBmaster_service,
+                and_(
+                    DBmaster_service.master_id == DBappointment.master_id,
+                    DBmaster_service.service_id == DBappointment.service_id
+                )
+            )
+            .where(*appointment_range)
+            .group_by(DBappointment.salon_id, DBappointment.master_id, DBappointment.service_id, day)
+        )
+        columns = ["salon_id", "master_id", "service_id", "day", *ROLLUP_COUNTERS]
+
+        async with self.session.begin():
+            if self._dialect == "postgresql":
+                # record ждёт конца пересчёта: запись, сделанная во время него,
+                # попадёт в итоги ровно один раз
+                await self.session.execute(text("LOCK TABLE booking_daily_rollups IN SHARE ROW EXCLUSIVE MODE"))
+            await self.session.execute(delete(DBrollup).where(*rollup_range))
+            result = await self.session.execute(DBrollup.__table__.insert().from_select(columns, aggregate))
+        return result.rowcount
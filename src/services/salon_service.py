@@ -12,12 +12,17 @@ from src.models import (salons as DBsalon,
                         appointments as DBappointment
 
 ) 
+from src.models.appointment import AppointmentStatus
 from src.repository.base_repo import BaseRepository
+from src.core.cache import catalog_cache
+from src.core.pagination import keyset_page
+from src.core.occupancy import occupancy_index
 
 from sqlalchemy.orm import selectinload
-from datetime import datetime, timedelta
+from datetime import datetime, date, time, timedelta
 from src.services.schedule_service import ScheduleService
 from src.services.review_service import ReviewService
+from src.services.rollup_service import RollupService
 class SalonService:
     """Сервис для работы с салонами"""
     
@@ -31,7 +36,14 @@ class SalonService:
         self.session = session
         self.repo = BaseRepository(DBsalon, session)
 
+    async def _catalog(self, key, loader):
+        """Данные каталога из catalog_cache; loader выполняется при промахе"""
+        return await catalog_cache.get_or_load(key, loader, self.session.info.get("replica_max_lag", 0.0))
+
     async def get_all_salons(self, only_active: bool = True):
+        return await self._catalog(("salons", only_active), lambda: self._load_salons(only_active))
+
+    async def _load_salons(self, only_active: bool):
         if only_active:
             stmt = select(DBsalon).where(DBsalon.is_active == True)
             result = await self.session.execute(stmt)
@@ -40,22 +52,41 @@ class SalonService:
             salons_ls = await self.repo.get_all()
         
         review_service = ReviewService(self.session)
+        ratings = await review_service.get_average_ratings(salon_ids=[salon.id for salon in salons_ls])
         
         salons_list = []
         for salon in salons_ls:
-            rating_stats = await review_service.get_rating_stats(salon_id=salon.id)
+            rating, reviews_count = ratings.get(salon.id, (0.0, 0))
             salons_list.append({
                 "id": salon.id,
                 "title": salon.title,
                 "address": salon.address,
                 "phone": salon.phone,
                 "photo_url": salon.photo_url,
-                "rating": rating_stats.average_rating,
-                "reviews_count": rating_stats.total_reviews
+                "rating": rating,
+                "reviews_count": reviews_count
             })
         return salons_list
     
     async def get_masters(self, salon_id:int | None = None, service_id:int | None = None, target_date:datetime | None = None):
+        masters_list = await self._catalog(
+            ("masters", salon_id, service_id),
+            lambda: self._load_masters(salon_id, service_id)
+        )
+
+        if target_date is not None and salon_id:
+            # доступность считается по расписанию конкретного салона и не кэшируется
+            schedule_svc = ScheduleService(self.session)
+            available_ids = set(await schedule_svc.get_available_masters(
+                salon_id=salon_id,
+                service_id=service_id,
+                target_date=target_date,
+                master_ids=[m["id"] for m in masters_list]
+            ))
+            masters_list = [m for m in masters_list if m["id"] in available_ids]
+        return masters_list
+
+    async def _load_masters(self, salon_id: int | None, service_id: int | None):
         from src.models import master_service as DBmaster_service
         
         if salon_id and service_id:
@@ -99,36 +130,27 @@ class SalonService:
         result = await self.session.execute(stmt)
         masters = result.scalars().all()
         
-        if target_date is not None:
-            schedule_svc = ScheduleService(self.session)
-            available = await schedule_svc.get_available_masters(salon_id=salon_id, date=target_date)
-            
-            if available is None:
-                available_ids = set()
-            else:
-                try:
-                    available_ids = {m.id for m in available}
-                except Exception:
-                    available_ids = set(available)
-            masters = [m for m in masters if m.id in available_ids]
-        
         review_service = ReviewService(self.session)
+        ratings = await review_service.get_average_ratings(master_ids=[master.id for master in masters])
         
         masters_list = []
         for master in masters:
-            rating_stats = await review_service.get_rating_stats(master_id=master.id)
+            rating, reviews_count = ratings.get(master.id, (0.0, 0))
             masters_list.append({
                 "id": master.id,
                 "photo": master.photo,
                 "specialization": master.specialization,
                 "about": master.about,
                 "user_id": master.user_id,
-                "rating": rating_stats.average_rating,
-                "reviews_count": rating_stats.total_reviews
+                "rating": rating,
+                "reviews_count": reviews_count
             })
         return masters_list
 
     async def get_services(self, salon_id:None = None ):
+        return await self._catalog(("services", salon_id), lambda: self._load_services(salon_id))
+
+    async def _load_services(self, salon_id: int | None):
             stmt = select(DBservice).where(DBservice.is_active == True)
             if salon_id:
                 stmt = (
@@ -226,7 +248,8 @@ class SalonService:
             salon.phone = salon_data.phone
             salon.photo_url = salon_data.photo_url    
 
-            return {"message":"edited successfully"}
+        catalog_cache.invalidate()
+        return {"message":"edited successfully"}
 
     async def create_salon(self, salon_data) -> dict:
         """Создание нового салона (для суперадмина)"""
@@ -241,17 +264,18 @@ class SalonService:
             )
             self.session.add(new_salon)
             await self.session.flush()
-            
-            return {
-                "message": "Salon created successfully",
-                "salon": {
-                    "id": new_salon.id,
-                    "title": new_salon.title,
-                    "address": new_salon.address,
-                    "phone": new_salon.phone,
-                    "photo_url": new_salon.photo_url
-                }
+
+        catalog_cache.invalidate()
+        return {
+            "message": "Salon created successfully",
+            "salon": {
+                "id": new_salon.id,
+                "title": new_salon.title,
+                "address": new_salon.address,
+                "phone": new_salon.phone,
+                "photo_url": new_salon.photo_url
             }
+        }
 
     async def update_salon(self, salon_id: int, salon_data: SalonCreate) -> dict:
         """Обновление салона (для суперадмина)"""
@@ -271,17 +295,18 @@ class SalonService:
             salon.address = salon_data.address
             salon.phone = salon_data.phone
             salon.photo_url = salon_data.photo_url
-            
-            return {
-                "message": "Salon updated successfully",
-                "salon": {
-                    "id": salon.id,
-                    "title": salon.title,
-                    "address": salon.address,
-                    "phone": salon.phone,
-                    "photo_url": salon.photo_url
-                }
+
+        catalog_cache.invalidate()
+        return {
+            "message": "Salon updated successfully",
+            "salon": {
+                "id": salon.id,
+                "title": salon.title,
+                "address": salon.address,
+                "phone": salon.phone,
+                "photo_url": salon.photo_url
             }
+        }
 
     async def delete_master_from_salon(self, salon_id: int, master_id: int, admin_id: int) -> dict:
         """Удаление мастера из салона"""
@@ -295,8 +320,9 @@ class SalonService:
                 )
             )
             await self.session.execute(stmt)
-            
-            return {"message": f"Master {master_id} deleted from salon {salon_id}"}
+
+        catalog_cache.invalidate()
+        return {"message": f"Master {master_id} deleted from salon {salon_id}"}
 
     async def add_master_to_salon(self, salon_id: int, master_email: str, admin_id: int) -> dict:
         """Добавление мастера в салон"""
@@ -337,18 +363,66 @@ class SalonService:
                 )
             
             salon.masters.append(dbmaster)
-            
-            return {"message": f"Master {dbmaster.id} successfully added to salon {salon_id}"}
 
-    async def get_appointments_for_salon(self, salon_id: int, admin_id: int) -> list[dict]:
-        """Получение всех записей салона"""
+        catalog_cache.invalidate()
+        return {"message": f"Master {dbmaster.id} successfully added to salon {salon_id}"}
+
+    async def get_appointments_for_salon(
+        self,
+        salon_id: int,
+        admin_id: int,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        master_id: int | None = None,
+        appointment_status: AppointmentStatus | None = None,
+        is_active: bool | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+        order: str = "desc"
+    ) -> dict:
+        """
+        Журнал записей салона: фильтры и постраничный вывод по (date_time, id)
+
+        Args:
+            salon_id: ID салона
+            admin_id: ID администратора (проверка доступа к салону)
+            date_from: первый день периода (включительно)
+            date_to: последний день периода (включительно)
+            master_id: ID мастера
+            appointment_status: статус записи
+            is_active: только активные (True) или только отменённые (False)
+            limit: размер страницы
+            cursor: next_cursor предыдущей страницы
+            order: порядок по времени записи (asc, desc)
+
+        Returns:
+            dict: записи страницы (items) и курсор следующей страницы (next_cursor)
+        """
         async with self.session.begin():
-            salon = await self.get_salon_for_admin(
-                admin_id=admin_id,
-                salon_id=salon_id,
-                dowload_apponimens=True
+            await self.get_salon_for_admin(admin_id=admin_id, salon_id=salon_id)
+
+            query = select(DBappointment).where(DBappointment.salon_id == salon_id)
+            if date_from:
+                query = query.where(DBappointment.date_time >= datetime.combine(date_from, time(0, 0)))
+            if date_to:
+                query = query.where(DBappointment.date_time < datetime.combine(date_to + timedelta(days=1), time(0, 0)))
+            if master_id:
+                query = query.where(DBappointment.master_id == master_id)
+            if appointment_status:
+                query = query.where(DBappointment.status == appointment_status)
+            if is_active is not None:
+                query = query.where(DBappointment.is_active == is_active)
+
+            descending = order.lower() == "desc"
+            appointments, next_cursor = await keyset_page(
+                self.session,
+                query,
+                [DBappointment.date_time, DBappointment.id],
+                descending,
+                limit,
+                cursor,
+                scope=f"date_time:{'desc' if descending else 'asc'}"
             )
-            appointments = salon.appointments
             
             appointments_list = []
             for apt in appointments:
@@ -364,7 +438,7 @@ class SalonService:
                     "created_at": apt.created_at.isoformat() if apt.created_at else None,
                     "is_active": apt.is_active
                 })
-            return appointments_list
+        return {"items": appointments_list, "next_cursor": next_cursor}
 
     async def delete_appointment_for_salon(
         self,
@@ -380,7 +454,7 @@ class SalonService:
                     DBappointment.id == appointment_id,
                     DBappointment.salon_id == salon_id
                 )
-            )
+            ).with_for_update()
             result_check = await self.session.execute(stmt_check)
             appointment = result_check.scalar_one_or_none()
             
@@ -398,17 +472,20 @@ class SalonService:
             
             appointment.is_active = False
             appointment.reason_for_deletion = reason
-            
-            return {"status": "success",
-                    "message": f"Appointment {appointment_id} deleted successfully.",
-                    "data": {
-                        "salon_id": salon_id,
-                        "appointment_id": appointment_id,
-                        "is_active": False,
-                        "reason_for_deletion": reason,
-                        "changed_by_admin_id": admin_id
-                    },
-                }
+            await RollupService(self.session).record(appointment, bookings=-1, cancellations=1)
+
+        occupancy_index.release(appointment.master_id, appointment.salon_id, appointment.date_time, appointment.end_time)
+
+        return {"status": "success",
+                "message": f"Appointment {appointment_id} deleted successfully.",
+                "data": {
+                    "salon_id": salon_id,
+                    "appointment_id": appointment_id,
+                    "is_active": False,
+                    "reason_for_deletion": reason,
+                    "changed_by_admin_id": admin_id
+                },
+            }
         
     async def update_salon_status(self, salon_id: int, is_active: bool, admin_id: int, reason: str=None) -> dict:
         """Активация/деактивация салона"""
@@ -420,16 +497,17 @@ class SalonService:
             else:
                 salon.reason_for_deletion = None
             
-            status_str = "activated" if is_active else "deactivated"
-            return {
-                    "status": "success",
-                    "message": f"Salon has been successfully {status_str}.",
-                    "data": {
-                        "salon_id": salon_id,
-                        "is_active": is_active,
-                        "changed_by_admin_id": admin_id
-                    },
-                }
+        catalog_cache.invalidate()
+        status_str = "activated" if is_active else "deactivated"
+        return {
+                "status": "success",
+                "message": f"Salon has been successfully {status_str}.",
+                "data": {
+                    "salon_id": salon_id,
+                    "is_active": is_active,
+                    "changed_by_admin_id": admin_id
+                },
+            }
 
 
     
\ No newline at end of file
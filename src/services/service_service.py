@@ -2,6 +2,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
+from src.core.cache import catalog_cache
 from src.models import services as DBservice
 from src.repository.base_repo import BaseRepository
 from src.schemas import ServiceCreate
@@ -24,16 +25,17 @@ class ServiceService:
             )
             self.session.add(new_service)
             await self.session.flush()
-            
-            return {
-                "message": "Service created successfully",
-                "service": {
-                    "id": new_service.id,
-                    "description": new_service.description,
-                    "duration_minutes": new_service.duration_minutes,
-                    "base_price": new_service.base_price
-                }
+
+        catalog_cache.invalidate()
+        return {
+            "message": "Service created successfully",
+            "service": {
+                "id": new_service.id,
+                "description": new_service.description,
+                "duration_minutes": new_service.duration_minutes,
+                "base_price": new_service.base_price
             }
+        }
     
     async def update_service(self, service_id: int, service_data: ServiceCreate) -> dict:
         """Обновление услуги"""
@@ -51,14 +53,15 @@ class ServiceService:
             service.description = service_data.description
             service.duration_minutes = service_data.duration_minutes
             service.base_price = service_data.base_price
-            
-            return {
-                "message": "Service updated successfully",
-                "service": {
-                    "id": service.id,
-                    "description": service.description,
-                    "duration_minutes": service.duration_minutes,
-                    "base_price": service.base_price
-                }
+
+        catalog_cache.invalidate()
+        return {
+            "message": "Service updated successfully",
+            "service": {
+                "id": service.id,
+                "description": service.description,
+                "duration_minutes": service.duration_minutes,
+                "base_price": service.base_price
             }
+        }
 
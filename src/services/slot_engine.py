@@ -0,0 +1,325 @@
+from dataclasses import dataclass, field
+from datetime import datetime, date, time, timedelta
+
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import schedule_cache
+from src.core.occupancy import (
+    occupancy_index,
+    days_between,
+    free_run_starts,
+    interval_mask,
+    minute_of_day,
+    range_mask
+)
+from src.models import (
+    appointments as DBappointment,
+    master_schedules as DBmaster_schedules,
+    salon_schedules as DBsalon_schedules
+)
+from src.schemas import DaySchedule
+
+
+SLOT_STEP = timedelta(minutes=15)
+
+
+def working_segments(target_date: date, schedule) -> list[tuple[datetime, datetime]]:
+    """
+    Рабочие отрезки дня с учётом перерыва
+
+    Сетка слотов выравнивается по началу каждого отрезка: до перерыва — от начала
+    рабочего дня, после перерыва — от его окончания.
+
+    Args:
+        target_date: день
+        schedule: строка расписания мастера или салона
+
+    Returns:
+        list[tuple[datetime, datetime]]: отрезки [начало, конец)
+    """
+    work_start = datetime.combine(target_date, schedule.start_time)
+    work_end = datetime.combine(target_date, schedule.end_time)
+    if not (schedule.break_start and schedule.break_end):
+        return [(work_start, work_end)]
+
+    break_start = datetime.combine(target_date, schedule.break_start)
+    break_end = datetime.combine(target_date, schedule.break_end)
+    segments = []
+    if work_start < min(break_start, work_end):
+        segments.append((work_start, min(break_start, work_end)))
+    if max(break_end, work_start) < work_end:
+        segments.append((max(break_end, work_start), work_end))
+    return segments
+
+
+def to_day_schedule(schedule) -> DaySchedule:
+    """Строка расписания салона или мастера в виде DaySchedule (без привязки к сессии)"""
+    return DaySchedule(
+        day_of_week=schedule.day_of_week,
+        start_time=schedule.start_time,
+        end_time=schedule.end_time,
+        break_start=schedule.break_start,
+        break_end=schedule.break_end,
+        is_working=schedule.is_working
+    )
+
+
+def _grid_start(origin: int, earliest: int, step: int) -> int:
+    """Первая точка сетки origin + k*step, не раньше earliest (в минутах)"""
+    if earliest <= origin:
+        return origin
+    return origin + -((origin - earliest) // step) * step
+
+
+def scan_free_slots(
+    segments: list[tuple[datetime, datetime]],
+    occupied: int,
+    target_date: date,
+    duration: timedelta,
+    not_before: datetime | None = None,
+    step: timedelta = SLOT_STEP,
+    limit: int | None = None,
+) -> list[tuple[datetime, datetime]]:
+    """
+    Свободные слоты по битовой карте занятости дня
+
+    Для каждого рабочего отрезка строится маска позиций, с которых начинается
+    свободный отрезок нужной длины, после чего проверяются только точки сетки.
+
+    Args:
+        segments: рабочие отрезки дня (по возрастанию)
+        occupied: битовая карта занятых минут дня
+        target_date: день
+        duration: продолжительность услуги
+        not_before: слоты раньше этого момента не показываются
+        step: шаг сетки слотов
+        limit: остановиться после указанного числа найденных слотов
+
+    Returns:
+        list[tuple[datetime, datetime]]: свободные слоты [начало, конец)
+    """
+    day_start = datetime.combine(target_date, time(0, 0))
+    length = -(-duration // timedelta(minutes=1))
+    step_minutes = step // timedelta(minutes=1)
+
+    earliest = 0
+    if not_before is not None:
+        if not_before.date() > target_date:
+            return []
+        if not_before > day_start:
+            earliest = -(-(not_before - day_start) // timedelta(minutes=1))
+
+    slots: list[tuple[datetime, datetime]] = []
+    for seg_start, seg_end in segments:
+        first = minute_of_day(seg_start, target_date)
+        last = minute_of_day(seg_end, target_date)
+        starts = free_run_starts(range_mask(first, last) & ~occupied, length)
+        if not starts:
+            continue
+        for minute in range(_grid_start(first, earliest, step_minutes), last - length + 1, step_minutes):
+            if starts >> minute & 1:
+                slot_start = day_start + timedelta(minutes=minute)
+                slots.append((slot_start, slot_start + duration))
+                if limit is not None and len(slots) >= limit:
+                    return slots
+    return slots
+
+
+@dataclass
+class AvailabilitySnapshot:
+    """Расписания и занятость мастеров салона за период"""
+    salon_schedules: dict[int, DaySchedule] = field(default_factory=dict)
+    master_schedules: dict[tuple[int, int], DaySchedule] = field(default_factory=dict)
+    occupancy: dict[tuple[int, date], int] = field(default_factory=dict)
+
+    def working_schedule(self, master_id: int, target_date: date):
+        """
+        Расписание, по которому мастер работает в этот день
+
+        Салон должен работать в этот день; если у мастера нет своего расписания,
+        используется расписание салона.
+        """
+        weekday = target_date.weekday()
+        salon_schedule = self.salon_schedules.get(weekday)
+        if not salon_schedule:
+            return None
+        return self.master_schedules.get((master_id, weekday), salon_schedule)
+
+    def free_slots(
+        self,
+        master_id: int,
+        target_date: date,
+        duration: timedelta,
+        not_before: datetime | None = None,
+        limit: int | None = None,
+    ) -> list[tuple[datetime, datetime]]:
+        """Свободные слоты мастера на день"""
+        schedule = self.working_schedule(master_id, target_date)
+        if not schedule:
+            return []
+        return scan_free_slots(
+            working_segments(target_date, schedule),
+            self.occupancy.get((master_id, target_date), 0),
+            target_date,
+            duration,
+            not_before,
+            limit=limit,
+        )
+
+    def available_masters(
+        self,
+        master_ids: list[int],
+        target_date: date,
+        duration: timedelta,
+        not_before: datetime | None = None,
+    ) -> list[int]:
+        """Мастера, у которых в этот день есть хотя бы одно свободное окно нужной длины"""
+        return [
+            m_id for m_id in master_ids
+            if self.free_slots(m_id, target_date, duration, not_before, limit=1)
+        ]
+
+
+class SlotEngine:
+    """Загрузка расписаний и карт занятости для расчёта свободных слотов"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def load(
+        self,
+        salon_id: int,
+        master_ids: list[int],
+        date_from: date,
+        date_to: date,
+    ) -> AvailabilitySnapshot:
+        """
+        Загрузка данных для расчёта слотов фиксированным числом запросов
+
+        Расписания берутся из schedule_cache, карты занятости — из occupancy_index;
+        таблица appointments читается одним запросом только для ключей, которых
+        в индексе ещё нет.
+
+        Args:
+            salon_id: ID салона
+            master_ids: ID мастеров-кандидатов
+            date_from: первый день периода
+            date_to: последний день периода (включительно)
+
+        Returns:
+            AvailabilitySnapshot: расписания и карты занятости по дням
+        """
+        salon_schedules, master_schedules = await self.load_schedules(salon_id)
+        snapshot = AvailabilitySnapshot(salon_schedules=salon_schedules, master_schedules=master_schedules)
+        if not master_ids:
+            return snapshot
+
+        missing: list[tuple[int, date]] = []
+        for offset in range((date_to - date_from).days + 1):
+            day = date_from + timedelta(days=offset)
+            for m_id in master_ids:
+                bitmap = occupancy_index.get(m_id, salon_id, day)
+                if bitmap is None:
+                    missing.append((m_id, day))
+                else:
+                    snapshot.occupancy[(m_id, day)] = bitmap
+
+        if missing:
+            snapshot.occupancy.update(await self._load_occupancy(salon_id, missing))
+        return snapshot
+
+    async def load_schedules(
+        self,
+        salon_id: int,
+    ) -> tuple[dict[int, DaySchedule], dict[tuple[int, int], DaySchedule]]:
+        """
+        Рабочие дни салона и всех его мастеров
+
+        Результат общий для всех запросов (schedule_cache) и не должен изменяться.
+
+        Returns:
+            tuple: расписание салона по дням недели и расписания мастеров
+                по (ID мастера, день недели)
+        """
+        return await schedule_cache.get_or_load(
+            ("salon", salon_id),
+            lambda: self._load_schedules(salon_id),
+            self.session.info.get("replica_max_lag", 0.0)
+        )
+
+    async def _load_schedules(
+        self,
+        salon_id: int,
+    ) -> tuple[dict[int, DaySchedule], dict[tuple[int, int], DaySchedule]]:
+        salon_schedule_stmt = select(DBsalon_schedules).where(
+            and_(
+                DBsalon_schedules.salon_id == salon_id,
+                DBsalon_schedules.is_working == True
+            )
+        )
+        salon_schedule_result = await self.session.execute(salon_schedule_stmt)
+        salon_schedules = {
+            schedule.day_of_week: to_day_schedule(schedule)
+            for schedule in salon_schedule_result.scalars().all()
+        }
+
+        master_schedule_stmt = select(DBmaster_schedules).where(
+            and_(
+                DBmaster_schedules.salon_id == salon_id,
+                DBmaster_schedules.is_working == True
+            )
+        )
+        master_schedule_result = await self.session.execute(master_schedule_stmt)
+        master_schedules = {
+            (schedule.master_id, schedule.day_of_week): to_day_schedule(schedule)
+            for schedule in master_schedule_result.scalars().all()
+        }
+        return salon_schedules, master_schedules
+
+    async def _load_occupancy(
+        self,
+        salon_id: int,
+        keys: list[tuple[int, date]],
+    ) -> dict[tuple[int, date], int]:
+        """
+        Построение недостающих карт занятости одним запросом к appointments
+
+        Args:
+            salon_id: ID салона
+            keys: пары (ID мастера, день), которых нет в occupancy_index
+
+        Returns:
+            dict[tuple[int, date], int]: карты занятости по ключам
+        """
+        loaded_version = occupancy_index.version
+        # сессия реплики: данные могут не содержать недавних изменений
+        max_lag = self.session.info.get("replica_max_lag", 0.0)
+        bitmaps = {key: 0 for key in keys}
+        master_ids = list({m_id for m_id, _ in keys})
+        range_start = datetime.combine(min(day for _, day in keys), time(0, 0))
+        range_end = datetime.combine(max(day for _, day in keys), time(0, 0)) + timedelta(days=1)
+
+        appointments_stmt = select(
+            DBappointment.master_id,
+            DBappointment.date_time,
+            DBappointment.end_time
+        ).where(
+            and_(
+                DBappointment.salon_id == salon_id,
+                DBappointment.master_id.in_(master_ids),
+                DBappointment.is_active == True,
+                DBappointment.date_time < range_end,
+                DBappointment.end_time > range_start,
+            )
+        )
+        appointments_result = await self.session.execute(appointments_stmt)
+        for m_id, start, end in appointments_result.all():
+            # запись через полночь учитывается в каждом затронутом дне
+            for day in days_between(start, end):
+                if (m_id, day) in bitmaps:
+                    bitmaps[(m_id, day)] |= interval_mask(start, end, day)
+
+        for (m_id, day), bitmap in bitmaps.items():
+            occupancy_index.put(m_id, salon_id, day, bitmap, loaded_version, max_lag)
+        return bitmaps
@@ -7,6 +7,7 @@ from fastapi import HTTPException, status
 from src.models import users as DBUser
 from src.repository.base_repo import BaseRepository
 from src.core.utils import hashing_password
+from src.core.security import invalidate_user_principal
 from src.schemas import User, UserEdit
 from src.models import appointments as DBappointment
 
@@ -166,18 +167,20 @@ class UserService:
             user.last_name = user_data.last_name
             user.email = user_data.email
             user.phone = user_data.phone
-            
-            return {
-                "status": "success",
-                "message": "User updated successfully",
-                "user": {
-                    "id": user.id,
-                    "first_name": user.first_name,
-                    "last_name": user.last_name,
-                    "email": user.email,
-                    "phone": user.phone
-                }
+
+        invalidate_user_principal(user_id)
+
+        return {
+            "status": "success",
+            "message": "User updated successfully",
+            "user": {
+                "id": user.id,
+                "first_name": user.first_name,
+                "last_name": user.last_name,
+                "email": user.email,
+                "phone": user.phone
             }
+        }
 
     async def delete_user(self, admin_id: int, user_id: int, reason: str) -> dict:
         """Удаление пользователя (soft delete)"""
@@ -200,16 +203,18 @@ class UserService:
             
             user_to_delete.is_active = False
             user_to_delete.reason_for_deletion = reason
-            
-            return {"status": "success",
-                    "message": f"User {user_id} deactivated successfully.",
-                    "data": {
-                        "user_id": user_id,
-                        "is_active": False,
-                        "reason_for_deletion": reason,
-                        "changed_by_admin_id": admin_id
-                    },
-                }
+
+        invalidate_user_principal(user_id)
+
+        return {"status": "success",
+                "message": f"User {user_id} deactivated successfully.",
+                "data": {
+                    "user_id": user_id,
+                    "is_active": False,
+                    "reason_for_deletion": reason,
+                    "changed_by_admin_id": admin_id
+                },
+            }
 
     async def get_all_users(self) -> list[dict]:
         """Получение списка всех пользователей"""
@@ -304,7 +309,9 @@ class UserService:
                 user.reason_for_deletion = reason
             else:
                 user.reason_for_deletion = None
-            
+
+        invalidate_user_principal(user_id)
+
         status_str = "activated" if status else "deactivated"
         return {
             "status": "success",